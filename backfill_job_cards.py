@@ -0,0 +1,32 @@
+"""Rewrites the job_card read model from the job tables.
+
+The migration that adds job cards fills them in; run this after renaming
+skills, locations, hirers or recruiters, whose names the cards embed, or
+after writing jobs around the API handlers. Safe to run while the API serves traffic: each batch commits
+on its own and handlers keep writing cards in the meantime.
+
+    python backfill_job_cards.py [--batch-size 1000]
+"""
+import argparse
+import time
+
+from pyjobs.models.database import session_maker
+from pyjobs.web.api.cards import backfill_job_cards
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = 0
+    with session_maker() as session:
+        for written in backfill_job_cards(session, args.batch_size):
+            total += written
+            print(f"wrote {total} job cards")
+    print(f"backfilled {total} job cards in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
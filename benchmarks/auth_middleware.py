@@ -0,0 +1,152 @@
+"""Requests/sec through the raw ASGI auth middleware vs the BaseHTTPMiddleware version.
+
+Both middlewares wrap the same minimal endpoint and validate a real RS256
+token signed with private_key.pem, so the numbers only differ by middleware
+overhead. Run from the repository root:
+
+    python -m benchmarks.auth_middleware [--requests 5000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from jose import ExpiredSignatureError, JWTError
+from jose.exceptions import JWTClaimsError
+from starlette import status
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from pyjobs.web.jwt_backends import JoseBackend
+from pyjobs.web.keys import load_public_key
+from pyjobs.web.middleware import AuthorizeRequestMiddleware
+from pyjobs.web.token_cache import TokenCache
+
+AUDIENCE = "https://pyjobs.works/jobs"
+
+backend = JoseBackend()
+public_key = load_public_key(Path("public_key.pem").read_text())
+token_cache = TokenCache()
+
+
+def validate_token(token):
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = backend.decode(token, public_key, algorithms=["RS256"], audience=AUDIENCE)
+        token_cache.set(token, claims)
+    return claims
+
+
+async def validate_token_async(token):
+    return validate_token(token)
+
+
+class BaseHTTPAuthorizeRequestMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation the ASGI middleware replaced."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        if os.getenv("AUTH_ON", "False") != "True":
+            request.state.user_id = "test"
+            return await call_next(request)
+
+        if request.url.path in ["/docs", "/openapi.json", "/redocs"]:
+            return await call_next(request)
+        if request.method == "OPTIONS":
+            return await call_next(request)
+
+        bearer_token = request.headers.get("Authorization")
+        if not bearer_token:
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={
+                    "detail": "Missing access token",
+                    "body": "Missing access token",
+                }
+            )
+        try:
+            auth_token = bearer_token.split(" ")[1].strip()
+            token_payload = validate_token(auth_token)
+        except (
+            ExpiredSignatureError,
+            JWTError,
+            JWTClaimsError,
+        ) as error:
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": str(error), "body": str(error)}
+            )
+        else:
+            request.state.user_id = int(token_payload["sub"])
+        return await call_next(request)
+
+
+async def whoami(request):
+    return JSONResponse({"user_id": request.state.user_id})
+
+
+def build_app(middleware):
+    app = Starlette(routes=[Route("/whoami", whoami)])
+    if middleware is AuthorizeRequestMiddleware:
+        app.add_middleware(middleware, auth_on=True, validate=validate_token_async)
+    else:
+        app.add_middleware(middleware)
+    return app
+
+
+def make_token():
+    now = datetime.now(timezone.utc)
+    return backend.encode(
+        {"sub": "1", "aud": AUDIENCE, "exp": int((now + timedelta(hours=1)).timestamp())},
+        key=Path("private_key.pem").read_text(),
+        algorithm="RS256",
+    )
+
+
+async def load_test(app, token, total, concurrency):
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/whoami", headers=headers)
+        assert response.json() == {"user_id": 1}, response.text
+
+        async def worker():
+            for _ in remaining:
+                await client.get("/whoami", headers=headers)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ["AUTH_ON"] = "True"
+    token = make_token()
+    results = {}
+    for name, middleware in (
+        ("BaseHTTPMiddleware", BaseHTTPAuthorizeRequestMiddleware),
+        ("raw ASGI", AuthorizeRequestMiddleware),
+    ):
+        results[name] = asyncio.run(
+            load_test(build_app(middleware), token, args.requests, args.concurrency)
+        )
+        print(f"{name:<20} {results[name]:>8.0f} req/s")
+    gain = results["raw ASGI"] / results["BaseHTTPMiddleware"] - 1
+    print(f"{'gain':<20} {gain * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Latency of JobMatchIndex.match over a synthetic skill index.
+
+Builds the postings in memory, no database needed: --jobs listings with
+five skills each, drawn from --skills skills with a skewed popularity, then
+times top-K queries for candidates with three to eight skills. Run from
+the repository root:
+
+    python -m benchmarks.job_matching [--jobs 300000] [--skills 200] [--limit 20]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from pyjobs.matching import JobMatchIndex, to_bitset
+
+
+def build_postings(jobs, skills, random_generator):
+    weights = [1 / (rank + 1) for rank in range(skills)]
+    postings = {skill: [] for skill in range(skills)}
+    for job in range(1, jobs + 1):
+        for skill in set(random_generator.choices(range(skills), weights, k=5)):
+            postings[skill].append(job)
+    return {skill: to_bitset(jobs) for skill, jobs in postings.items() if jobs}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=300000)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    random_generator = random.Random(42)
+    index = JobMatchIndex()
+    index._postings = build_postings(args.jobs, args.skills, random_generator)
+    candidates = [
+        [
+            (skill, random_generator.randrange(10))
+            for skill in random_generator.sample(range(args.skills), random_generator.randint(3, 8))
+        ]
+        for _ in range(args.queries)
+    ]
+
+    for weighted in (False, True):
+        latencies = []
+        for skills in candidates:
+            start = time.perf_counter()
+            index.match(skills, args.limit, weighted=weighted)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(
+            f"{'weighted' if weighted else 'overlap':>9} p50 {statistics.median(latencies) * 1000:>7.2f} ms "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:>7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Latency of GET /jobs/search against a LIKE scan over synthetic listings.
+
+Builds a throwaway SQLite database (migrated to head, so the FTS5 index and
+its triggers exist), inserts --jobs synthetic listings and compares the
+search endpoint, in-process, with the equivalent LIKE query. Building the
+default million listings takes a few minutes; pass --database to reuse one.
+Run from the repository root:
+
+    python -m benchmarks.job_search [--jobs 1000000] [--database /tmp/search.db]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+TERMS = ("engineer", "python", "senior data", "museum", "kubernetes platform", "zyzzyva")
+
+TITLE_WORDS = (
+    "senior junior lead principal staff backend frontend fullstack data platform "
+    "engineer developer architect analyst scientist manager consultant designer "
+    "museum education finance retail health logistics"
+).split()
+
+DESCRIPTION_WORDS = (
+    "python java golang rust typescript django flask fastapi kubernetes docker "
+    "aws azure gcp postgres kafka spark airflow remote hybrid team product growth "
+    "payments search ranking"
+).split()
+
+
+def build_vocabulary(random_generator, size=5000):
+    # Zipf-like frequencies: a few filler words are everywhere, most are rare,
+    # and the domain words are spread through the middle of the distribution
+    words = ["".join(random_generator.choices("abcdefghijklmnopqrstuvwxyz", k=7)) for _ in range(size)]
+    for position, word in enumerate(TITLE_WORDS + DESCRIPTION_WORDS):
+        words[20 + position * 40] = word
+    return words, [1 / (rank + 1) for rank in range(size)]
+
+
+def build_database(url, jobs):
+    from alembic import command
+    from alembic.config import Config
+
+    # pyjobs reads DATABASE_URL when it's first imported
+    os.environ["DATABASE_URL"] = url
+    from pyjobs.models.database import create_db_engine
+
+    command.upgrade(Config("alembic.ini"), "head")
+
+    engine = create_db_engine(url, pooled=False)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO hirer (id, created, updated, name) VALUES (1, :now, :now, 'Hirer')"
+        ), {"now": now})
+        connection.execute(text(
+            "INSERT INTO recruiter (id, created, updated, name, email, hirer_id) "
+            "VALUES (1, :now, :now, 'Recruiter', 'recruiter@example.com', 1)"
+        ), {"now": now})
+        connection.execute(text(
+            "INSERT INTO location (id, created, updated, city, country) VALUES (1, :now, :now, 'London', 'UK')"
+        ), {"now": now})
+        connection.execute(text(
+            "INSERT INTO skill (id, created, updated, name) VALUES (1, :now, :now, 'Python')"
+        ), {"now": now})
+
+    random_generator = random.Random(42)
+    vocabulary, weights = build_vocabulary(random_generator)
+    chunk_size = 10000
+    for start in range(1, jobs + 1, chunk_size):
+        rows = [
+            {
+                "id": id_,
+                "now": now,
+                "title": " ".join(random_generator.sample(TITLE_WORDS, 3)),
+                "description": " ".join(random_generator.choices(vocabulary, weights, k=60)),
+                "contract_type": random_generator.choice(("contract", "permanent")),
+                "date_posted": (now - timedelta(days=random_generator.randrange(365))).date(),
+                "live_until": now + timedelta(days=30),
+            }
+            for id_ in range(start, min(start + chunk_size, jobs + 1))
+        ]
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO job (id, created, updated, hirer_id, recruiter_id, title, rate, rate_per_time_unit, "
+                "rate_annualized, contract_type, description, date_posted, live_until, location_id, visible) "
+                "VALUES (:id, :now, :now, 1, 1, :title, 500, 'day', 127500, :contract_type, :description, "
+                ":date_posted, :live_until, 1, 1)"
+            ), rows)
+            connection.execute(
+                text("INSERT INTO skills_job_association (job, skill) VALUES (:id, 1)"), rows
+            )
+    engine.dispose()
+
+
+def measure(fn, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=1000000)
+    parser.add_argument("--database", help="SQLite file to reuse or create")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), "search.db")
+    url = f"sqlite:///{path}"
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        build_database(url, args.jobs)
+        print(f"built {args.jobs} listings in {time.perf_counter() - start:.1f}s at {path}")
+
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("AUTH_ON", "False")
+    os.environ.setdefault("RESPONSE_CACHE", "off")
+    os.environ.setdefault("COUNT_STRATEGY_SEARCH", "none")
+    from fastapi.testclient import TestClient
+    from pyjobs.models.database import create_db_engine
+    from pyjobs.web.server import server
+
+    client = TestClient(server)
+    engine = create_db_engine(url)
+    with engine.connect() as connection:
+        for term in TERMS:
+            like = " AND ".join(
+                f"(title LIKE :w{index} OR description LIKE :w{index})" for index in range(len(term.split()))
+            )
+            params = {f"w{index}": f"%{word}%" for index, word in enumerate(term.split())}
+
+            def like_scan():
+                connection.execute(
+                    text(f"SELECT id FROM job WHERE {like} ORDER BY date_posted DESC, id DESC LIMIT 20"), params
+                ).fetchall()
+
+            def search():
+                client.get("/jobs/search", params={"q": term, "perPage": 20}).raise_for_status()
+
+            print(
+                f"{term!r:>24} search {measure(search, args.repeat):>8.1f} ms "
+                f"LIKE scan {measure(like_scan, args.repeat):>8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
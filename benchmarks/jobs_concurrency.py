@@ -0,0 +1,69 @@
+"""Throughput of GET /jobs at 1, 10 and 100 concurrent clients.
+
+Runs against the app in-process by default, using DATABASE_URL like the
+server does. Set ASYNC_DB=False to measure the sync fallback, or pass --url
+to hit a running server instead. Run from the repository root:
+
+    python -m benchmarks.jobs_concurrency [--requests 2000] [--path "/jobs?perPage=20"]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+CONCURRENCY_LEVELS = (1, 10, 100)
+
+
+async def load_test(client, path, total, concurrency):
+    remaining = iter(range(total))
+    latencies = []
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+async def run(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=httpx.Limits(max_connections=None))
+    else:
+        os.environ.setdefault("AUTH_ON", "False")
+        from pyjobs.web.server import server
+
+        client = httpx.AsyncClient(app=server, base_url="http://test")
+
+    async with client:
+        await client.get(args.path)
+        for concurrency in CONCURRENCY_LEVELS:
+            throughput, p50, p99 = await load_test(client, args.path, args.requests, concurrency)
+            print(
+                f"{concurrency:>4} clients {throughput:>9.1f} req/s "
+                f"p50 {p50 * 1000:>7.1f} ms p99 {p99 * 1000:>7.1f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--path", default="/jobs?perPage=20")
+    parser.add_argument("--url", help="base URL of a running server")
+    args = parser.parse_args()
+
+    mode = "sync fallback" if os.getenv("ASYNC_DB", "True") != "True" else "async session"
+    print(f"GET {args.path} ({'live server' if args.url else mode})")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Sign/verify throughput, latency and allocations per JWT backend and algorithm.
+
+RS256 uses the repository's key pair (private_key.pem / public_key.pem). The
+repository has no EC or Ed25519 keys, so ES256 and EdDSA use key pairs
+generated at start-up. Run from the repository root:
+
+    python -m benchmarks.jwt_backends [--iterations 2000]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from pyjobs.web.jwt_backends import backends
+from pyjobs.web.keys import load_public_key
+
+AUDIENCE = "https://pyjobs.works/jobs"
+
+
+def load_key_pairs():
+    rsa_private_key = serialization.load_pem_private_key(
+        Path("private_key.pem").read_bytes(), password=None
+    )
+    ec_private_key = ec.generate_private_key(ec.SECP256R1())
+    ed_private_key = ed25519.Ed25519PrivateKey.generate()
+    secret = "pyjobs-benchmark-secret-with-at-least-32-bytes"
+    return {
+        "RS256": (rsa_private_key, load_public_key(Path("public_key.pem").read_text())),
+        "ES256": (ec_private_key, ec_private_key.public_key()),
+        "EdDSA": (ed_private_key, ed_private_key.public_key()),
+        "HS256": (secret, secret),
+    }
+
+
+def make_claims():
+    now = datetime.now(timezone.utc)
+    return {
+        "iss": "https://auth.pyjobs.works",
+        "sub": "1",
+        "aud": AUDIENCE,
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(hours=1)).timestamp()),
+    }
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def measure(operation, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops": iterations / sum(latencies),
+        "p50": percentile(latencies, 0.50) * 1e6,
+        "p99": percentile(latencies, 0.99) * 1e6,
+        "mean": statistics.fmean(latencies) * 1e6,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(iterations):
+    key_pairs = load_key_pairs()
+    claims = make_claims()
+    rows = []
+    for backend_name, backend_class in backends.items():
+        backend = backend_class()
+        for algorithm, (signing_key, verifying_key) in key_pairs.items():
+            try:
+                token = backend.encode(claims, signing_key, algorithm)
+                backend.decode(token, verifying_key, algorithms=[algorithm], audience=AUDIENCE)
+            except Exception as error:
+                rows.append((backend_name, algorithm, None, None, f"unsupported: {error}"))
+                continue
+            sign = measure(lambda: backend.encode(claims, signing_key, algorithm), iterations)
+            verify = measure(
+                lambda: backend.decode(token, verifying_key, algorithms=[algorithm], audience=AUDIENCE),
+                iterations,
+            )
+            rows.append((backend_name, algorithm, sign, verify, None))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<9} {'alg':<6} {'sign/s':>9} {'verify/s':>9} "
+        f"{'p50 us':>8} {'p99 us':>8} {'peak KiB':>9}"
+    )
+    for backend_name, algorithm, sign, verify, error in run(args.iterations):
+        if error:
+            print(f"{backend_name:<9} {algorithm:<6} {error[:60]}")
+            continue
+        print(
+            f"{backend_name:<9} {algorithm:<6} {sign['ops']:>9.0f} {verify['ops']:>9.0f} "
+            f"{verify['p50']:>8.1f} {verify['p99']:>8.1f} {verify['peak_kib']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
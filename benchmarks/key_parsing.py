@@ -0,0 +1,77 @@
+"""Per-token verify time with raw key material vs pre-parsed key objects.
+
+Run from the repository root:
+
+    python -m benchmarks.key_parsing
+"""
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import jwt as pyjwt
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from jose import jwt as jose_jwt
+from jose import jwk as jose_jwk
+from jwcrypto import jwk as jwcrypto_jwk
+from jwcrypto import jwt as jwcrypto_jwt
+
+from pyjobs.web.keys import load_public_key
+
+AUDIENCE = "https://pyjobs.works/jobs"
+NUMBER = 500
+
+private_key = Path("private_key.pem").read_text()
+public_certificate = Path("public_key.pem").read_text()
+public_pem = load_public_key(public_certificate).public_bytes(
+    encoding=Encoding.PEM, format=PublicFormat.SubjectPublicKeyInfo
+).decode()
+public_jwk = jose_jwk.construct(public_pem, "RS256").to_dict()
+
+now = datetime.now(timezone.utc)
+token = jose_jwt.encode(
+    claims={
+        "iss": "https://auth.pyjobs.works",
+        "sub": "1",
+        "aud": AUDIENCE,
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(hours=1)).timestamp()),
+    },
+    key=private_key,
+    algorithm="RS256",
+)
+
+public_key = load_public_key(public_certificate)
+jwcrypto_key = jwcrypto_jwk.JWK.from_pyca(public_key)
+
+
+def jwcrypto_decode(key):
+    return jwcrypto_jwt.JWT(key=key, jwt=token, algs=["RS256"], check_claims={"aud": AUDIENCE}).claims
+
+
+cases = {
+    "jose": (
+        lambda: jose_jwt.decode(token, public_pem, audience=AUDIENCE, algorithms=["RS256"]),
+        lambda: jose_jwt.decode(token, public_key, audience=AUDIENCE, algorithms=["RS256"]),
+    ),
+    "pyjwt": (
+        lambda: pyjwt.decode(token, public_pem, audience=AUDIENCE, algorithms=["RS256"]),
+        lambda: pyjwt.decode(token, public_key, audience=AUDIENCE, algorithms=["RS256"]),
+    ),
+    "jwcrypto": (
+        lambda: jwcrypto_decode(jwcrypto_jwk.JWK(**public_jwk)),
+        lambda: jwcrypto_decode(jwcrypto_key),
+    ),
+}
+
+
+def main():
+    print(f"{'library':<10} {'raw (us)':>10} {'parsed (us)':>12} {'saving':>8}")
+    for library, (raw, parsed) in cases.items():
+        raw_time = min(timeit.repeat(raw, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        parsed_time = min(timeit.repeat(parsed, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        saving = (raw_time - parsed_time) / raw_time * 100
+        print(f"{library:<10} {raw_time:>10.1f} {parsed_time:>12.1f} {saving:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@ from pathlib import Path
 
 from jose import jwt, jws
 
-public_certificate = Path("public_key.pem").read_text()
+from pyjobs.web.keys import load_public_key
+
+public_certificate = load_public_key(Path("public_key.pem").read_text())
 
 
 def validate_token(token):
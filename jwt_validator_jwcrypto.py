@@ -5,9 +5,9 @@ from pathlib import Path
 
 from jwcrypto import jwk, jwt
 
-public_certificate = Path("public_key.pem").read_text()
-jwk_key = jwk.JWK()
-jwk_key.import_from_pem(data=public_certificate.encode())
+from pyjobs.web.keys import load_public_key
+
+jwk_key = jwk.JWK.from_pyca(load_public_key(Path("public_key.pem").read_text()))
 
 
 def validate_token(token):
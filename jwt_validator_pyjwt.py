@@ -1,11 +1,10 @@
 from pathlib import Path
 
 import jwt
-from cryptography.x509 import load_pem_x509_certificate
 
-x509_certificate = load_pem_x509_certificate(
-    Path("public_key.pem").read_text().encode()
-).public_key()
+from pyjobs.web.keys import load_public_key
+
+x509_certificate = load_public_key(Path("public_key.pem").read_text())
 
 
 def validate_token(token):
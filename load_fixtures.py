@@ -2,10 +2,11 @@ import random
 from datetime import datetime, timedelta
 
 from faker import Faker
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
+from pyjobs.models.database import session_maker
 from pyjobs.models.models import Candidate, Hirer, Job, Recruiter, Location, Skill
+from pyjobs.web.api.cards import backfill_job_cards
+from pyjobs.web.api.facets import rebuild_facet_counts
 
 fake = Faker()
 
@@ -51,7 +52,7 @@ def load_jobs(skills, session):
             recruiter_id=1,
             description="Being a cool Python tech lead",
             live_until=datetime.utcnow() + timedelta(days=random.randint(10, 60)),
-            skills=[skills[random.randint(0, 15)] for _ in range(5)],
+            skills=random.sample(skills, 5),
         )
 
         session.add(job)
@@ -62,13 +63,13 @@ def load_candidates(skills, session):
         name="Wow Whew",
         email="wow.whew@gmail.com",
         location_id=1,
-        skills=[skills[random.randint(0, 15)] for _ in range(5)],
+        skills=random.sample(skills, 5),
     )
     candidate2 = Candidate(
         name="Joe Whey",
         email="joe.whew@gmail.com",
         location_id=1,
-        skills=[skills[random.randint(0, 15)] for _ in range(5)],
+        skills=random.sample(skills, 5),
     )
 
     session.add(candidate1)
@@ -76,7 +77,6 @@ def load_candidates(skills, session):
 
 
 def load_fixtures():
-    session_maker = sessionmaker(bind=create_engine("sqlite:///database.db"))
     location = Location(city="London", country="UK")
     hirer = Hirer(name="PyJobs.works")
     recruiter = Recruiter(name="Joe Wow", email="joe@pyjobs.works")
@@ -94,8 +94,13 @@ def load_fixtures():
 
         load_candidates(skills, session)
         load_jobs(skills, session)
+        session.flush()
+        rebuild_facet_counts(session)
 
         session.commit()
 
+        for _ in backfill_job_cards(session):
+            pass
+
 
 load_fixtures()
@@ -0,0 +1,54 @@
+"""Add facet counters for visible jobs
+
+Revision ID: 3f7b9e1d2a60
+Revises: 8d3a6b2c4e17
+Create Date: 2026-10-18 16:22:09.318540
+
+"""
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7b9e1d2a60'
+down_revision = '8d3a6b2c4e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    job_facet_count = op.create_table('job_facet_count',
+    sa.Column('facet', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('live_until_day', sa.Date(), nullable=False),
+    sa.Column('job_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value', 'live_until_day', name='pk_job_facet_count')
+    )
+
+    job = sa.table('job', sa.column('id'), sa.column('contract_type'), sa.column('location_id'),
+                   sa.column('live_until', sa.DateTime()), sa.column('visible'))
+    skills_job_association = sa.table('skills_job_association', sa.column('job'), sa.column('skill'))
+    connection = op.get_bind()
+    counts = Counter()
+    for contract_type, location_id, live_until in connection.execute(
+        sa.select(job.c.contract_type, job.c.location_id, job.c.live_until).where(job.c.visible == sa.true())
+    ):
+        counts['contractType', contract_type, live_until.date()] += 1
+        counts['location', str(location_id), live_until.date()] += 1
+    for skill, live_until in connection.execute(
+        sa.select(skills_job_association.c.skill, job.c.live_until)
+        .select_from(skills_job_association.join(job, job.c.id == skills_job_association.c.job))
+        .where(job.c.visible == sa.true())
+    ):
+        counts['skill', str(skill), live_until.date()] += 1
+    if counts:
+        op.bulk_insert(job_facet_count, [
+            {'facet': facet, 'value': value, 'live_until_day': day, 'job_count': job_count}
+            for (facet, value, day), job_count in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('job_facet_count')
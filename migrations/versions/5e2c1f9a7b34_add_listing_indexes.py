@@ -0,0 +1,72 @@
+"""Add indexes for listing filters and sorts
+
+Revision ID: 5e2c1f9a7b34
+Revises: 1bcf88084e5f
+Create Date: 2026-10-18 10:40:12.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2c1f9a7b34'
+down_revision = '1bcf88084e5f'
+branch_labels = None
+depends_on = None
+
+
+def _deduplicate(table, key_columns, *value_columns):
+    # Primary keys can't be added while the fixtures' duplicate pairs exist
+    connection = op.get_bind()
+    columns = ", ".join(key_columns)
+    values = "".join(f", max({column})" for column in value_columns)
+    rows = connection.execute(
+        sa.text(f"SELECT {columns}{values} FROM {table} GROUP BY {columns}")
+    ).fetchall()
+    connection.execute(sa.text(f"DELETE FROM {table}"))
+    if rows:
+        all_columns = [*key_columns, *value_columns]
+        connection.execute(
+            sa.text(
+                f"INSERT INTO {table} ({', '.join(all_columns)}) "
+                f"VALUES ({', '.join(':' + column for column in all_columns)})"
+            ),
+            [dict(zip(all_columns, row)) for row in rows],
+        )
+
+
+def upgrade() -> None:
+    _deduplicate('skills_job_association', ['job', 'skill'])
+    with op.batch_alter_table('skills_job_association') as batch_op:
+        batch_op.create_primary_key('pk_skills_job_association', ['job', 'skill'])
+        batch_op.create_index('ix_skills_job_association_skill_job', ['skill', 'job'])
+
+    _deduplicate('skills_candidate_association', ['candidate', 'skill'], 'years_experience')
+    with op.batch_alter_table('skills_candidate_association') as batch_op:
+        batch_op.create_primary_key('pk_skills_candidate_association', ['candidate', 'skill'])
+        batch_op.create_index('ix_skills_candidate_association_skill_candidate', ['skill', 'candidate'])
+
+    op.create_index('ix_job_date_posted', 'job', ['date_posted'])
+    op.create_index('ix_job_rate_annualized', 'job', ['rate_annualized'])
+    op.create_index('ix_job_contract_type_date_posted', 'job', ['contract_type', 'date_posted'])
+    op.create_index('ix_job_contract_type_rate_annualized', 'job', ['contract_type', 'rate_annualized'])
+    op.create_index('ix_job_application_candidate_id_created', 'job_application', ['candidate_id', 'created'])
+    op.create_index('ix_job_application_created', 'job_application', ['created'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_application_created', table_name='job_application')
+    op.drop_index('ix_job_application_candidate_id_created', table_name='job_application')
+    op.drop_index('ix_job_contract_type_rate_annualized', table_name='job')
+    op.drop_index('ix_job_contract_type_date_posted', table_name='job')
+    op.drop_index('ix_job_rate_annualized', table_name='job')
+    op.drop_index('ix_job_date_posted', table_name='job')
+
+    with op.batch_alter_table('skills_candidate_association') as batch_op:
+        batch_op.drop_index('ix_skills_candidate_association_skill_candidate')
+        batch_op.drop_constraint('pk_skills_candidate_association', type_='primary')
+
+    with op.batch_alter_table('skills_job_association') as batch_op:
+        batch_op.drop_index('ix_skills_job_association_skill_job')
+        batch_op.drop_constraint('pk_skills_job_association', type_='primary')
@@ -0,0 +1,31 @@
+"""Add the replica heartbeat
+
+Revision ID: 6c2d8f4a1e95
+Revises: a41c8e5f9d03
+Create Date: 2026-10-18 19:05:42.118306
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c2d8f4a1e95'
+down_revision = 'a41c8e5f9d03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    replica_heartbeat = op.create_table('replica_heartbeat',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('beat', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(replica_heartbeat, [{'id': 1, 'beat': datetime.utcnow()}])
+
+
+def downgrade() -> None:
+    op.drop_table('replica_heartbeat')
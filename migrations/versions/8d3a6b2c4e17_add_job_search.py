@@ -0,0 +1,64 @@
+"""Add full-text search over job titles and descriptions
+
+Revision ID: 8d3a6b2c4e17
+Revises: 5e2c1f9a7b34
+Create Date: 2026-10-18 14:05:41.502118
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3a6b2c4e17'
+down_revision = '5e2c1f9a7b34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # External content table: the index stores tokens only, rows stay in job
+        op.execute(
+            "CREATE VIRTUAL TABLE job_search USING fts5("
+            "title, description, content='job', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER job_search_insert AFTER INSERT ON job BEGIN "
+            "INSERT INTO job_search(rowid, title, description) VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER job_search_delete AFTER DELETE ON job BEGIN "
+            "INSERT INTO job_search(job_search, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER job_search_update AFTER UPDATE OF title, description ON job BEGIN "
+            "INSERT INTO job_search(job_search, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO job_search(rowid, title, description) VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute("INSERT INTO job_search(job_search) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE job ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_job_search_vector ON job USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER job_search_update")
+        op.execute("DROP TRIGGER job_search_delete")
+        op.execute("DROP TRIGGER job_search_insert")
+        op.execute("DROP TABLE job_search")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX ix_job_search_vector")
+        op.execute("ALTER TABLE job DROP COLUMN search_vector")
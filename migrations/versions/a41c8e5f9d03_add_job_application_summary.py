@@ -0,0 +1,51 @@
+"""Add per-job application index and daily application counts
+
+Revision ID: a41c8e5f9d03
+Revises: 3f7b9e1d2a60
+Create Date: 2026-10-18 17:48:30.771254
+
+"""
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c8e5f9d03'
+down_revision = '3f7b9e1d2a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_job_application_job_listing_id_cancelled_id', 'job_application', ['job_listing_id', 'cancelled', 'id']
+    )
+    job_application_daily_count = op.create_table('job_application_daily_count',
+    sa.Column('job_listing_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('cancelled', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_listing_id'], ['job.id'], ),
+    sa.PrimaryKeyConstraint('job_listing_id', 'day', name='pk_job_application_daily_count')
+    )
+
+    job_application = sa.table('job_application', sa.column('job_listing_id'), sa.column('created', sa.DateTime()),
+                               sa.column('cancelled', sa.Boolean()))
+    totals, cancelled = Counter(), Counter()
+    for job_listing_id, created, is_cancelled in op.get_bind().execute(
+        sa.select(job_application.c.job_listing_id, job_application.c.created, job_application.c.cancelled)
+    ):
+        totals[job_listing_id, created.date()] += 1
+        cancelled[job_listing_id, created.date()] += int(is_cancelled)
+    if totals:
+        op.bulk_insert(job_application_daily_count, [
+            {'job_listing_id': job_listing_id, 'day': day, 'total': total, 'cancelled': cancelled[job_listing_id, day]}
+            for (job_listing_id, day), total in totals.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('job_application_daily_count')
+    op.drop_index('ix_job_application_job_listing_id_cancelled_id', table_name='job_application')
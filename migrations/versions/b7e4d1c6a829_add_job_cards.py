@@ -0,0 +1,105 @@
+"""Add job cards
+
+Revision ID: b7e4d1c6a829
+Revises: e5a7c3d9b201
+Create Date: 2026-10-18 21:34:18.602417
+
+"""
+from collections import defaultdict
+
+from alembic import op
+import orjson
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d1c6a829'
+down_revision = 'e5a7c3d9b201'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    job_card = op.create_table('job_card',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date_posted', sa.Date(), nullable=False),
+    sa.Column('rate_annualized', sa.Float(), nullable=False),
+    sa.Column('contract_type', sa.String(), nullable=False),
+    sa.Column('visible', sa.Boolean(), nullable=False),
+    sa.Column('document', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['id'], ['job.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_card_date_posted_id', 'job_card', ['date_posted', 'id'])
+    op.create_index('ix_job_card_rate_annualized_id', 'job_card', ['rate_annualized', 'id'])
+    op.create_index('ix_job_card_contract_type_date_posted_id', 'job_card', ['contract_type', 'date_posted', 'id'])
+    op.create_index(
+        'ix_job_card_contract_type_rate_annualized_id', 'job_card', ['contract_type', 'rate_annualized', 'id']
+    )
+
+    # The same documents as pyjobs.web.api.cards writes, from the tables as of this revision
+    job = sa.table('job', sa.column('id'), sa.column('title'), sa.column('date_posted', sa.Date()),
+                   sa.column('rate', sa.Float()), sa.column('rate_per_time_unit'),
+                   sa.column('rate_annualized', sa.Float()), sa.column('benefits'), sa.column('contract_type'),
+                   sa.column('live_until', sa.DateTime()), sa.column('location_id'), sa.column('hirer_id'),
+                   sa.column('recruiter_id'), sa.column('visible', sa.Boolean()))
+    location = sa.table('location', sa.column('id'), sa.column('city'), sa.column('state'), sa.column('country'))
+    hirer = sa.table('hirer', sa.column('id'), sa.column('name'))
+    recruiter = sa.table('recruiter', sa.column('id'), sa.column('name'), sa.column('email'))
+    skill = sa.table('skill', sa.column('id'), sa.column('name'))
+    skills_job_association = sa.table('skills_job_association', sa.column('job'), sa.column('skill'))
+    connection = op.get_bind()
+    locations = {
+        row.id: {'city': row.city, 'state': row.state, 'country': row.country} if row.state is not None
+        else {'city': row.city, 'country': row.country}
+        for row in connection.execute(sa.select(location))
+    }
+    hirers = {row.id: row.name for row in connection.execute(sa.select(hirer))}
+    recruiters = {row.id: {'name': row.name, 'email': row.email} for row in connection.execute(sa.select(recruiter))}
+    last_id = 0
+    while True:
+        jobs = connection.execute(
+            sa.select(job).where(job.c.id > last_id).order_by(job.c.id).limit(1000)
+        ).all()
+        if not jobs:
+            break
+        skills = defaultdict(list)
+        for job_id, name in connection.execute(
+            sa.select(skills_job_association.c.job, skill.c.name)
+            .select_from(skills_job_association.join(skill, skill.c.id == skills_job_association.c.skill))
+            .where(skills_job_association.c.job.in_([row.id for row in jobs]))
+            .order_by(skills_job_association.c.job, skill.c.id)
+        ):
+            skills[job_id].append(name)
+        op.bulk_insert(job_card, [
+            {
+                'id': row.id,
+                'date_posted': row.date_posted,
+                'rate_annualized': row.rate_annualized,
+                'contract_type': row.contract_type,
+                'visible': row.visible,
+                'document': orjson.dumps({
+                    'id': row.id,
+                    'title': row.title,
+                    'dateListed': row.date_posted,
+                    'rate': {'amount': float(row.rate), 'amountPerTime': row.rate_per_time_unit},
+                    'benefits': row.benefits or '',
+                    'location': locations[row.location_id],
+                    'hirer': hirers[row.hirer_id],
+                    'recruiter': recruiters[row.recruiter_id],
+                    'contractType': row.contract_type,
+                    'skills': skills[row.id],
+                    'liveUntil': row.live_until,
+                }).decode(),
+            }
+            for row in jobs
+        ])
+        last_id = jobs[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_card_contract_type_rate_annualized_id', table_name='job_card')
+    op.drop_index('ix_job_card_contract_type_date_posted_id', table_name='job_card')
+    op.drop_index('ix_job_card_rate_annualized_id', table_name='job_card')
+    op.drop_index('ix_job_card_date_posted_id', table_name='job_card')
+    op.drop_table('job_card')
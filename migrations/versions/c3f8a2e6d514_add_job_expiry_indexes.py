@@ -0,0 +1,49 @@
+"""Add indexes for hiding expired jobs
+
+Revision ID: c3f8a2e6d514
+Revises: b7e4d1c6a829
+Create Date: 2026-10-18 22:41:05.276913
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a2e6d514'
+down_revision = 'b7e4d1c6a829'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_job_visible_live_until', 'job', ['visible', 'live_until'])
+
+    # GET /jobs filters on visible now
+    op.drop_index('ix_job_card_contract_type_rate_annualized_id', table_name='job_card')
+    op.drop_index('ix_job_card_contract_type_date_posted_id', table_name='job_card')
+    op.drop_index('ix_job_card_rate_annualized_id', table_name='job_card')
+    op.drop_index('ix_job_card_date_posted_id', table_name='job_card')
+    op.create_index('ix_job_card_visible_date_posted_id', 'job_card', ['visible', 'date_posted', 'id'])
+    op.create_index('ix_job_card_visible_rate_annualized_id', 'job_card', ['visible', 'rate_annualized', 'id'])
+    op.create_index(
+        'ix_job_card_visible_contract_type_date_posted_id', 'job_card', ['visible', 'contract_type', 'date_posted', 'id']
+    )
+    op.create_index(
+        'ix_job_card_visible_contract_type_rate_annualized_id', 'job_card',
+        ['visible', 'contract_type', 'rate_annualized', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_card_visible_contract_type_rate_annualized_id', table_name='job_card')
+    op.drop_index('ix_job_card_visible_contract_type_date_posted_id', table_name='job_card')
+    op.drop_index('ix_job_card_visible_rate_annualized_id', table_name='job_card')
+    op.drop_index('ix_job_card_visible_date_posted_id', table_name='job_card')
+    op.create_index('ix_job_card_date_posted_id', 'job_card', ['date_posted', 'id'])
+    op.create_index('ix_job_card_rate_annualized_id', 'job_card', ['rate_annualized', 'id'])
+    op.create_index('ix_job_card_contract_type_date_posted_id', 'job_card', ['contract_type', 'date_posted', 'id'])
+    op.create_index(
+        'ix_job_card_contract_type_rate_annualized_id', 'job_card', ['contract_type', 'rate_annualized', 'id']
+    )
+
+    op.drop_index('ix_job_visible_live_until', table_name='job')
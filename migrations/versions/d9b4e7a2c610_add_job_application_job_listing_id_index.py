@@ -0,0 +1,24 @@
+"""Add index for listing a job's applications without a cancelled filter
+
+Revision ID: d9b4e7a2c610
+Revises: c3f8a2e6d514
+Create Date: 2026-10-18 23:52:17.408316
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9b4e7a2c610'
+down_revision = 'c3f8a2e6d514'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (job_listing_id, cancelled, id) only orders by id once cancelled is fixed too
+    op.create_index('ix_job_application_job_listing_id_id', 'job_application', ['job_listing_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_application_job_listing_id_id', table_name='job_application')
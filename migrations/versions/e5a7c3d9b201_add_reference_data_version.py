@@ -0,0 +1,29 @@
+"""Add the reference data version
+
+Revision ID: e5a7c3d9b201
+Revises: 6c2d8f4a1e95
+Create Date: 2026-10-18 20:12:37.504912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c3d9b201'
+down_revision = '6c2d8f4a1e95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    reference_data_version = op.create_table('reference_data_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(reference_data_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('reference_data_version')
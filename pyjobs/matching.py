@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import Job, skills_job_association
+
+logger = logging.getLogger(__name__)
+
+MAX_EXPERIENCE_WEIGHT = 5
+
+
+def experience_weight(years):
+    return min(1 + (years or 0), MAX_EXPERIENCE_WEIGHT)
+
+
+def to_bitset(job_ids):
+    bits = bytearray(max(job_ids) // 8 + 1)
+    for job_id in job_ids:
+        bits[job_id >> 3] |= 1 << (job_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_bits(bitset):
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+def add_weighted(planes, bitset, weight):
+    """Adds ``weight`` to the score of every job in ``bitset``.
+
+    Scores are bit-sliced: bit ``i`` of ``planes[p]`` is bit ``p`` of job
+    ``i``'s score, so the addition is a ripple-carry over whole bitsets.
+    """
+    for shift in range(weight.bit_length()):
+        if not weight >> shift & 1:
+            continue
+        carry, plane = bitset, shift
+        while carry:
+            while plane >= len(planes):
+                planes.append(0)
+            planes[plane], carry = planes[plane] ^ carry, planes[plane] & carry
+            plane += 1
+
+
+def top_jobs(planes, limit):
+    """Ids of the ``limit`` best scored jobs, walking the planes from the top bit."""
+    selected = 0
+    candidates = 0
+    for plane in planes:
+        candidates |= plane
+    for plane in reversed(planes):
+        with_bit = candidates & plane
+        count = selected.bit_count() + with_bit.bit_count()
+        if count > limit:
+            candidates = with_bit
+            continue
+        selected |= with_bit
+        candidates &= ~plane
+        if count == limit:
+            break
+    # Ties at the cutoff go to the lowest ids
+    remaining = limit - selected.bit_count()
+    ties = (job_id for _, job_id in zip(range(remaining), iter_bits(candidates)))
+    return [*iter_bits(selected), *ties]
+
+
+def score_of(planes, job_id):
+    return sum(1 << position for position, plane in enumerate(planes) if plane >> job_id & 1)
+
+
+class JobMatchIndex:
+    """Inverted index from skill id to a bitset of the jobs asking for it.
+
+    Only jobs that are visible and live when the index is built are included.
+    A background thread rebuilds it every ``refresh_interval`` seconds and
+    shortly after `invalidate` is called, but never more often than once every
+    ``min_refresh_interval`` seconds, so a burst of writes costs one rebuild.
+    """
+
+    def __init__(self, refresh_interval=300, min_refresh_interval=5):
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._postings = None
+        self._refresh_lock = threading.Lock()
+        self._invalidated = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._postings is not None
+
+    @staticmethod
+    def build(session):
+        rows = session.query(skills_job_association.c.skill, skills_job_association.c.job).join(
+            Job, Job.id == skills_job_association.c.job
+        ).filter(
+            Job.visible == True, Job.live_until > datetime.utcnow()
+        ).order_by(
+            skills_job_association.c.skill, skills_job_association.c.job
+        ).yield_per(10000)
+        return {
+            skill: to_bitset([job for _, job in postings])
+            for skill, postings in groupby(rows, itemgetter(0))
+        }
+
+    def refresh(self):
+        with self._refresh_lock:
+            start = time.monotonic()
+            with session_maker() as session:
+                postings = self.build(session)
+            # Swap the whole dict so readers never see a partially built index
+            self._postings = postings
+            logger.info(
+                "Built job match index with %d skills and %d postings in %.2fs",
+                len(postings), sum(bitset.bit_count() for bitset in postings.values()), time.monotonic() - start,
+            )
+
+    def invalidate(self):
+        self._invalidated.set()
+
+    def match(self, skills, limit, weighted=True):
+        """Top ``limit`` ``(job_id, score)`` pairs for ``skills``, best first.
+
+        ``skills`` holds ``(skill_id, years_experience)`` pairs. Every shared
+        skill scores 1, or `experience_weight` of its years when ``weighted``.
+        """
+        postings = self._postings or {}
+        planes = []
+        for skill, years in skills:
+            jobs = postings.get(skill)
+            if jobs:
+                add_weighted(planes, jobs, experience_weight(years) if weighted else 1)
+        matches = [(job_id, score_of(planes, job_id)) for job_id in top_jobs(planes, limit)]
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Failed to build the job match index")
+
+    def _run(self):
+        self._safe_refresh()
+        while not self._stop.is_set():
+            if self._invalidated.wait(self.refresh_interval):
+                self._stop.wait(self.min_refresh_interval)
+            if self._stop.is_set():
+                break
+            self._invalidated.clear()
+            self._safe_refresh()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-match-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._invalidated.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+job_match_index = JobMatchIndex(
+    refresh_interval=float(os.getenv("MATCH_INDEX_REFRESH_INTERVAL", "300")),
+    min_refresh_interval=float(os.getenv("MATCH_INDEX_MIN_REFRESH_INTERVAL", "5")),
+)
@@ -0,0 +1,38 @@
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql, sqlite
+
+UPSERT_DIALECTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def increment_counters(session, table, key_columns, rows):
+    """Adds each row's counter values to the row with the same key, creating it if needed.
+
+    ``rows`` are dicts with the ``key_columns`` and the counter columns to
+    add to. Uses INSERT ... ON CONFLICT where the dialect supports it, and
+    an UPDATE followed by an INSERT for missing rows elsewhere.
+    """
+    if not rows:
+        return
+    counter_columns = [column for column in rows[0] if column not in key_columns]
+    upsert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        statement = upsert(table)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={column: table.c[column] + statement.excluded[column] for column in counter_columns},
+            ),
+            rows,
+        )
+        return
+    for row in rows:
+        updated = session.execute(
+            table.update().where(and_(
+                *(table.c[column] == row[column] for column in key_columns)
+            )).values({column: table.c[column] + row[column] for column in counter_columns})
+        )
+        if updated.rowcount == 0:
+            session.execute(table.insert(), row)
@@ -0,0 +1,268 @@
+import functools
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import anyio
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///database.db")
+# Read-only copy of DATABASE_URL, kept up to date by replication outside the app,
+# e.g. a streaming standby, or locally a second SQLite file refreshed with
+# `while sleep 1; do sqlite3 database.db ".backup replica.db"; done`
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True") == "True"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Negative sizes are in KiB, so this is 64 MiB of page cache per connection
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+
+POSTGRES_STATEMENT_TIMEOUT = int(os.getenv("POSTGRES_STATEMENT_TIMEOUT", "30000"))
+POSTGRES_APPLICATION_NAME = os.getenv("POSTGRES_APPLICATION_NAME", "pyjobs")
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_url(url):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the writer; NORMAL is durable under WAL
+    # except for the last transactions on power loss
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.close()
+
+
+def _pool_options(is_async):
+    return {
+        "poolclass": AsyncAdaptedQueuePool if is_async else QueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_profile(url, is_async):
+    if url.database in (None, "", ":memory:"):
+        # Every connection to an in-memory database is a new database
+        return {}
+    if is_async:
+        # Every aiosqlite connection owns a non-daemon thread, so pooled ones
+        # would keep the process alive; opening a SQLite file is cheap anyway
+        return {"poolclass": NullPool}
+    # Pooled connections move between threads, one at a time
+    return {**_pool_options(is_async), "connect_args": {"check_same_thread": False}}
+
+
+def postgres_profile(url, is_async):
+    options = {**_pool_options(is_async), "pool_recycle": DB_POOL_RECYCLE}
+    if is_async:
+        options["connect_args"] = {"server_settings": {
+            "statement_timeout": str(POSTGRES_STATEMENT_TIMEOUT),
+            "application_name": POSTGRES_APPLICATION_NAME,
+        }}
+    else:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={POSTGRES_STATEMENT_TIMEOUT}",
+            "application_name": POSTGRES_APPLICATION_NAME,
+        }
+    return options
+
+
+POOL_OPTIONS = ("poolclass", "pool_size", "max_overflow", "pool_pre_ping", "pool_recycle")
+
+ENGINE_PROFILES = {
+    "sqlite": sqlite_profile,
+    "postgresql": postgres_profile,
+}
+
+
+def engine_options(url, is_async=False, pooled=True):
+    profile = ENGINE_PROFILES.get(make_url(url).get_backend_name())
+    options = profile(make_url(url), is_async) if profile else {}
+    if not pooled:
+        options = {key: value for key, value in options.items() if key not in POOL_OPTIONS}
+        options["poolclass"] = NullPool
+    return options
+
+
+def _configure(engine):
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+def create_db_engine(url=DATABASE_URL, pooled=True, **options):
+    """Engine for ``url`` with the settings of its backend's profile.
+
+    Every engine in the project comes from here, so the API, the fixtures
+    loader and migrations all run with the same pool and SQLite pragmas.
+    ``pooled=False`` opens a connection per checkout, for one-off scripts;
+    ``options`` override the profile.
+    """
+    return _configure(create_engine(url, **{**engine_options(url, pooled=pooled), **options}))
+
+
+def create_async_db_engine(url=DATABASE_URL, pooled=True, **options):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_engine = create_async_engine(
+        get_async_url(url), **{**engine_options(url, is_async=True, pooled=pooled), **options}
+    )
+    _configure(async_engine.sync_engine)
+    return async_engine
+
+
+engine = create_db_engine()
+session_maker = sessionmaker(bind=engine)
+
+replica_engine = create_db_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
+replica_session_maker = sessionmaker(bind=replica_engine) if replica_engine is not None else None
+
+
+def _create_async_engine(url):
+    if url is None or os.getenv("ASYNC_DB", "True") != "True":
+        return None
+    try:
+        return create_async_db_engine(url)
+    except (ImportError, KeyError):
+        # No async driver for this database, use the sync engine from a thread
+        return None
+
+
+def _async_session_maker(async_engine):
+    if async_engine is None:
+        return None
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    return sessionmaker(bind=async_engine, class_=AsyncSession)
+
+
+async_engine = _create_async_engine(DATABASE_URL)
+async_session_maker = _async_session_maker(async_engine)
+
+async_replica_engine = _create_async_engine(DATABASE_REPLICA_URL)
+async_replica_session_maker = _async_session_maker(async_replica_engine)
+
+# Set by ReadReplicaMiddleware while a request may read from the replica
+use_replica = ContextVar("use_replica", default=False)
+
+
+def _session_makers():
+    if use_replica.get() and replica_session_maker is not None:
+        return replica_session_maker, async_replica_session_maker
+    return session_maker, async_session_maker
+
+
+def _run_in_sync_session(make_session, fn, *args, **kwargs):
+    with make_session() as session:
+        return fn(session, *args, **kwargs)
+
+
+async def run_in_session(fn, *args, **kwargs):
+    """Runs ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    ``fn`` is plain synchronous ORM code. With an async driver available it
+    runs through `AsyncSession.run_sync`, so lazy loads work as usual;
+    otherwise it runs with a sync session in a worker thread. Sessions come
+    from the replica while `use_replica` is set, from the primary otherwise.
+    """
+    make_session, make_async_session = _session_makers()
+    if make_async_session is not None:
+        async with make_async_session() as session:
+            return await session.run_sync(fn, *args, **kwargs)
+    return await anyio.to_thread.run_sync(
+        functools.partial(_run_in_sync_session, make_session, fn, *args, **kwargs)
+    )
+
+
+async def dispose_engines():
+    for target in (engine, replica_engine):
+        if target is not None:
+            target.dispose()
+    for target in (async_engine, async_replica_engine):
+        if target is not None:
+            await target.dispose()
+
+
+async def stream_in_session(fn, *args, **kwargs):
+    """Async-iterates ``fn(session, *args, **kwargs)``, a synchronous generator.
+
+    The generator runs in one worker thread with a sync session for its whole
+    life, so a server-side cursor stays on the connection and thread that
+    opened it. Items are handed over one at a time, so a slow client stalls
+    the cursor instead of buffering the result set.
+    """
+    send_stream, receive_stream = anyio.create_memory_object_stream(1)
+    make_session, _ = _session_makers()
+
+    def produce():
+        try:
+            with make_session() as session:
+                for item in fn(session, *args, **kwargs):
+                    anyio.from_thread.run(send_stream.send, item)
+        except anyio.BrokenResourceError:
+            # The consumer went away, e.g. the client disconnected
+            pass
+        finally:
+            anyio.from_thread.run_sync(send_stream.close)
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(anyio.to_thread.run_sync, produce)
+        async with receive_stream:
+            async for item in receive_stream:
+                yield item
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+        self.parameters = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+
+@contextmanager
+def count_queries():
+    """Counts the SQL statements issued by the API engines inside the block.
+
+        with count_queries() as queries:
+            ...
+        assert queries.count <= 3, queries.statements
+    """
+    engines = [target for target in (engine, replica_engine) if target is not None]
+    for target in (async_engine, async_replica_engine):
+        if target is not None:
+            engines.append(target.sync_engine)
+    counter = QueryCounter()
+    for target in engines:
+        event.listen(target, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", counter)
@@ -1,7 +1,8 @@
 from datetime import datetime
 
-from sqlalchemy import Column, String, Integer, ForeignKey, Date, DateTime, Float, UniqueConstraint, Boolean
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import Column, String, Integer, ForeignKey, Date, DateTime, Float, UniqueConstraint, Boolean, Index, \
+    PrimaryKeyConstraint, event
+from sqlalchemy.orm import Session, declarative_base, relationship
 from sqlalchemy.testing.schema import Table
 
 
@@ -19,6 +20,8 @@ skills_job_association = Table(
     Base.metadata,
     Column("skill", ForeignKey("skill.id"), nullable=False),
     Column("job", ForeignKey("job.id"), nullable=False),
+    PrimaryKeyConstraint("job", "skill", name="pk_skills_job_association"),
+    Index("ix_skills_job_association_skill_job", "skill", "job"),
 )
 
 
@@ -28,6 +31,68 @@ skills_candidate_association = Table(
     Column("skill", ForeignKey("skill.id"), nullable=False),
     Column("candidate", ForeignKey("candidate.id"), nullable=False),
     Column("years_experience", type_=Integer),
+    PrimaryKeyConstraint("candidate", "skill", name="pk_skills_candidate_association"),
+    Index("ix_skills_candidate_association_skill_candidate", "skill", "candidate"),
+)
+
+
+# Visible jobs per filter value, bucketed by the day they stop being live
+job_facet_count = Table(
+    "job_facet_count",
+    Base.metadata,
+    Column("facet", String, nullable=False),
+    Column("value", String, nullable=False),
+    Column("live_until_day", Date, nullable=False),
+    Column("job_count", Integer, nullable=False, default=0),
+    PrimaryKeyConstraint("facet", "value", "live_until_day", name="pk_job_facet_count"),
+)
+
+
+# Applications per job and day they were made, and how many were cancelled since
+job_application_daily_count = Table(
+    "job_application_daily_count",
+    Base.metadata,
+    Column("job_listing_id", ForeignKey("job.id"), nullable=False),
+    Column("day", Date, nullable=False),
+    Column("total", Integer, nullable=False, default=0),
+    Column("cancelled", Integer, nullable=False, default=0),
+    PrimaryKeyConstraint("job_listing_id", "day", name="pk_job_application_daily_count"),
+)
+
+
+# One row, stamped on the primary and read back on the replica to measure its lag
+replica_heartbeat = Table(
+    "replica_heartbeat",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("beat", DateTime, nullable=False),
+)
+
+
+# One row, bumped whenever skills, locations, hirers or recruiters change
+reference_data_version = Table(
+    "reference_data_version",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+)
+
+
+# Each job's listing document, serialized when the job is written, with the
+# columns GET /jobs filters and sorts on, so listings read this table alone
+job_card = Table(
+    "job_card",
+    Base.metadata,
+    Column("id", ForeignKey("job.id"), primary_key=True),
+    Column("date_posted", Date, nullable=False),
+    Column("rate_annualized", Float, nullable=False),
+    Column("contract_type", String, nullable=False),
+    Column("visible", Boolean, nullable=False),
+    Column("document", String, nullable=False),
+    Index("ix_job_card_visible_date_posted_id", "visible", "date_posted", "id"),
+    Index("ix_job_card_visible_rate_annualized_id", "visible", "rate_annualized", "id"),
+    Index("ix_job_card_visible_contract_type_date_posted_id", "visible", "contract_type", "date_posted", "id"),
+    Index("ix_job_card_visible_contract_type_rate_annualized_id", "visible", "contract_type", "rate_annualized", "id"),
 )
 
 
@@ -108,6 +173,13 @@ class Hirer(Base):
 
 class Job(Base):
     __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_date_posted", "date_posted"),
+        Index("ix_job_rate_annualized", "rate_annualized"),
+        Index("ix_job_contract_type_date_posted", "contract_type", "date_posted"),
+        Index("ix_job_contract_type_rate_annualized", "contract_type", "rate_annualized"),
+        Index("ix_job_visible_live_until", "visible", "live_until"),
+    )
 
     hirer_id = Column(Integer, ForeignKey("hirer.id"), nullable=False)
     recruiter_id = Column(Integer, ForeignKey("recruiter.id"), nullable=False)
@@ -188,6 +260,12 @@ class Candidate(Base):
 
 class JobApplication(Base):
     __tablename__ = "job_application"
+    __table_args__ = (
+        Index("ix_job_application_candidate_id_created", "candidate_id", "created"),
+        Index("ix_job_application_created", "created"),
+        Index("ix_job_application_job_listing_id_cancelled_id", "job_listing_id", "cancelled", "id"),
+        Index("ix_job_application_job_listing_id_id", "job_listing_id", "id"),
+    )
 
     candidate_id = Column(Integer, ForeignKey("candidate.id"), nullable=False)
     job_listing_id = Column(Integer, ForeignKey("job.id"), nullable=False)
@@ -209,3 +287,21 @@ class JobApplication(Base):
             f"<JobApplication: id={self.id}, created={self.created}, updated={self.updated},"
             f"candidate_id={self.candidate_id}, job_listing_id={self.job_listing_id}>"
         )
+
+
+REFERENCE_MODELS = (Skill, Location, Hirer, Recruiter)
+
+
+@event.listens_for(Session, "after_flush")
+def bump_reference_data_version(session, flush_context):
+    """Bumps ``reference_data_version`` in the transaction of any ORM write to a reference table.
+
+    Writes that bypass the ORM must bump it themselves, or processes caching
+    the tables won't notice them.
+    """
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, REFERENCE_MODELS) for instance in changed):
+        session.execute(
+            reference_data_version.update().values(version=reference_data_version.c.version + 1)
+        )
+        session.info["reference_data_changed"] = True
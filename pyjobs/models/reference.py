@@ -0,0 +1,152 @@
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import Hirer, Location, Recruiter, Skill, reference_data_version
+
+logger = logging.getLogger(__name__)
+
+# Tables keyed by id, in the order their listings are sorted in
+Snapshot = namedtuple("Snapshot", "version skills locations hirers recruiters hirer_recruiters")
+
+
+class ReferenceData:
+    """Process-wide copy of the skill, location, hirer and recruiter tables.
+
+    They are small and nearly static, so handlers and serializers read them
+    from here instead of the database. Any ORM write to them bumps
+    ``reference_data_version`` (see `bump_reference_data_version`): the
+    writing process reloads on its next read, and a background thread
+    reloads every ``refresh_interval`` seconds if another process bumped it.
+    """
+
+    def __init__(self, refresh_interval=30):
+        self.refresh_interval = refresh_interval
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self):
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None else self.refresh()
+
+    @staticmethod
+    def load(session):
+        version = session.execute(select(reference_data_version.c.version)).scalar() or 0
+        skills = {
+            skill.id: skill for skill in session.query(Skill.id, Skill.name).order_by(Skill.name, Skill.id)
+        }
+        recruiters = {
+            recruiter.id: recruiter
+            for recruiter in session.query(Recruiter.id, Recruiter.name, Recruiter.email, Recruiter.hirer_id)
+            .order_by(Recruiter.id)
+        }
+        hirer_recruiters = {}
+        for recruiter in recruiters.values():
+            hirer_recruiters.setdefault(recruiter.hirer_id, recruiter.id)
+        return Snapshot(
+            version=version,
+            skills=skills,
+            locations={
+                location.id: location
+                for location in session.query(Location.id, Location.city, Location.state, Location.country)
+                .order_by(Location.country, Location.city, Location.id)
+            },
+            hirers={hirer.id: hirer for hirer in session.query(Hirer.id, Hirer.name).order_by(Hirer.id)},
+            recruiters=recruiters,
+            hirer_recruiters=hirer_recruiters,
+        )
+
+    def refresh(self):
+        with self._refresh_lock:
+            start = time.monotonic()
+            with session_maker() as session:
+                snapshot = self.load(session)
+            self._snapshot = snapshot
+            logger.info(
+                "Loaded reference data version %d with %d skills and %d locations in %.3fs",
+                snapshot.version, len(snapshot.skills), len(snapshot.locations), time.monotonic() - start,
+            )
+            return snapshot
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def _get(self, table, id_):
+        row = getattr(self.snapshot, table).get(id_)
+        if row is None:
+            # Referenced by a row written since the last reload
+            row = getattr(self.refresh(), table)[id_]
+        return row
+
+    def location(self, location_id):
+        return self._get("locations", location_id)
+
+    def hirer(self, hirer_id):
+        return self._get("hirers", hirer_id)
+
+    def recruiter(self, recruiter_id):
+        return self._get("recruiters", recruiter_id)
+
+    def skill(self, skill_id):
+        return self._get("skills", skill_id)
+
+    def _poll(self):
+        with session_maker() as session:
+            version = session.execute(select(reference_data_version.c.version)).scalar() or 0
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != version:
+            self.refresh()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self._poll()
+            except Exception:
+                logger.exception("Failed to reload reference data")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception:
+            # Readers load it on first use instead
+            logger.exception("Failed to load reference data")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reference-data", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+reference_data = ReferenceData(
+    refresh_interval=float(os.getenv("REFERENCE_DATA_REFRESH_INTERVAL", "30")),
+)
+
+
+@event.listens_for(Session, "after_commit")
+def reload_after_reference_write(session):
+    if session.info.pop("reference_data_changed", False):
+        reference_data.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_reference_write(session, previous_transaction):
+    session.info.pop("reference_data_changed", None)
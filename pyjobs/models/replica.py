@@ -0,0 +1,131 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from pyjobs.models.database import replica_session_maker, session_maker
+from pyjobs.models.models import replica_heartbeat
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaMonitor:
+    """Tracks how far the read replica is behind the primary.
+
+    Every ``interval`` seconds a background thread stamps the time into
+    ``replica_heartbeat`` on the primary and reads the row back from the
+    replica. Replication applies writes in order, so the replica holds every
+    write committed before the stamp it returns, its position. The replica is
+    healthy while its position is at most ``max_lag`` seconds old; a replica
+    that falls behind, can't be reached, or stops being checked ages out of
+    health on its own and reads go back to the primary.
+    """
+
+    def __init__(self, interval=1, max_lag=5):
+        self.interval = interval
+        self.max_lag = timedelta(seconds=max_lag)
+        self._position = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return replica_session_maker is not None
+
+    @property
+    def lag(self):
+        if self._position is None:
+            return None
+        return datetime.utcnow() - self._position
+
+    @property
+    def healthy(self):
+        lag = self.lag
+        return lag is not None and lag <= self.max_lag
+
+    def caught_up(self, written_at=None):
+        """Whether reads that must see writes committed by ``written_at`` can use the replica."""
+        position = self._position
+        return self.healthy and (written_at is None or position >= written_at)
+
+    def after_caught_up(self, written_at, callback):
+        """Calls ``callback`` once the replica has caught up with ``written_at``.
+
+        It is also called as soon as the replica is unhealthy, since reads go
+        to the primary then. Without a replica it is never called.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.append((written_at, callback))
+
+    def _run_pending(self):
+        with self._lock:
+            if self.healthy:
+                due = [callback for written_at, callback in self._pending if written_at <= self._position]
+                self._pending = [
+                    (written_at, callback) for written_at, callback in self._pending if written_at > self._position
+                ]
+            else:
+                due, self._pending = [callback for _, callback in self._pending], []
+        for callback in due:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Failed to run a callback waiting for the replica")
+
+    def check(self):
+        beat = datetime.utcnow()
+        with session_maker() as session:
+            stamped = session.execute(
+                update(replica_heartbeat).where(replica_heartbeat.c.id == 1).values(beat=beat)
+            ).rowcount
+            if not stamped:
+                session.execute(insert(replica_heartbeat).values(id=1, beat=beat))
+            session.commit()
+        with replica_session_maker() as session:
+            position = session.execute(
+                select(replica_heartbeat.c.beat).where(replica_heartbeat.c.id == 1)
+            ).scalar()
+        was_healthy = self.healthy
+        self._position = position
+        if self.healthy and not was_healthy:
+            logger.info("Read replica caught up, lag %s", self.lag)
+        elif was_healthy and not self.healthy:
+            logger.warning("Read replica is %s behind, reading from the primary", self.lag)
+
+    def _safe_check(self):
+        try:
+            self.check()
+        except Exception:
+            logger.exception("Failed to check the read replica")
+        finally:
+            self._run_pending()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._safe_check()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+replica_monitor = ReplicaMonitor(
+    interval=float(os.getenv("REPLICA_CHECK_INTERVAL", "1")),
+    max_lag=float(os.getenv("REPLICA_MAX_LAG", "5")),
+)
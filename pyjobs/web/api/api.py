@@ -1,39 +1,147 @@
-import uuid
+import math
+import os
+from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime, date
 from typing import Optional
 
+import anyio
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import conint
-from sqlalchemy import create_engine, desc, asc
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import Response
-
-from pyjobs.models.models import Job, Skill, Location, JobApplication
+from starlette.responses import Response, StreamingResponse
+
+from pyjobs.matching import job_match_index
+from pyjobs.models.counters import increment_counters
+from pyjobs.models.database import run_in_session, stream_in_session
+from pyjobs.models.models import Job, Skill, Location, JobApplication, Candidate, \
+    skills_job_association, skills_candidate_association, job_facet_count, job_application_daily_count, job_card
+from pyjobs.models.reference import reference_data
+from pyjobs.web.cache import invalidate_responses
+from pyjobs.web.api.cards import query_job_listings, job_listing_columns, load_skill_names, save_job_card, \
+    save_job_cards, set_job_card_visibility, delete_job_card
+from pyjobs.web.api.export import export_formats
+from pyjobs.web.api.facets import facet_keys, job_facet_keys, update_facet_counts
+from pyjobs.web.api.ingest import read_items, BatchReport, bulk_insert
+from pyjobs.web.api.pagination import paginate, paginate_rows, count_pages, count_row_pages, count_cache, \
+    get_count_strategy
+from pyjobs.web.api.search import search_jobs
 from pyjobs.web.api.schemas import GetJobSchema, ListJobsSchema, CreateJobSchema, ContractTypeEnum, SortByEnum, \
     SortByOrder, AmountPerTimeEnum, ListSkills, ListLocations, GetJobApplication, ListJobApplications, \
-    CreateJobApplication
-
-session_maker = sessionmaker(bind=create_engine("sqlite:///database.db"))
+    CreateJobApplication, ExportFormatEnum, ListJobMatches, JobFacets, ListJobApplicants
+from pyjobs.web.api.serializers import serialize_job, serialize_application, serialize_applicant_row
 
 router = APIRouter()
 
+# Skip response_model validation and encode with orjson on the read hot paths
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "False") == "True"
+
+JOBS_BATCH_CHUNK_SIZE = int(os.getenv("JOBS_BATCH_CHUNK_SIZE", "1000"))
+JOBS_EXPORT_BATCH_SIZE = int(os.getenv("JOBS_EXPORT_BATCH_SIZE", "1000"))
+
+count_strategies = {
+    endpoint: get_count_strategy(endpoint)
+    for endpoint in ("skills", "locations", "applications", "jobs", "search")
+}
+
+application_loading_options = (
+    joinedload(JobApplication.job_listing),
+)
+
+
+def job_reference_errors(job_details, reference):
+    """Errors for the skills, location and hirer of a CreateJobSchema missing from a reference snapshot."""
+    errors = []
+    # CreateJobSchema.skills holds ids as strings
+    unknown_skills = [
+        skill_id for skill_id in job_details.skills if not skill_id.isdigit() or int(skill_id) not in reference.skills
+    ]
+    if unknown_skills:
+        errors.append({"loc": ["skills"], "msg": f"Unknown skills {', '.join(unknown_skills)}"})
+    if job_details.location not in reference.locations:
+        errors.append({"loc": ["location"], "msg": f"Unknown location {job_details.location}"})
+    if job_details.hirer not in reference.hirer_recruiters:
+        errors.append({"loc": ["hirer"], "msg": f"Unknown hirer {job_details.hirer} or hirer without recruiters"})
+    return errors
+
+
+async def check_job_references(job_details):
+    """Answers 422 unless the job's references exist, and returns the snapshot that has them."""
+    reference = await load_reference_data()
+    errors = job_reference_errors(job_details, reference)
+    if errors:
+        # They may have been written since the last reload, as in ReferenceData._get
+        reference = await anyio.to_thread.run_sync(reference_data.refresh)
+        errors = job_reference_errors(job_details, reference)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[{"loc": ["body", *error["loc"]], "msg": error["msg"], "type": "value_error"} for error in errors],
+        )
+    return reference
+
+
+def job_skill_ids(job_details):
+    return sorted({int(skill_id) for skill_id in job_details.skills})
+
+
+def skill_names(skill_ids):
+    return [reference_data.skill(skill_id).name for skill_id in skill_ids]
+
+
+def add_job_skills(session, job_id, skill_ids):
+    if skill_ids:
+        session.execute(skills_job_association.insert(), [
+            {"job": job_id, "skill": skill_id} for skill_id in skill_ids
+        ])
+
+
+async def load_reference_data():
+    if not reference_data.ready:
+        await anyio.to_thread.run_sync(reference_data.refresh)
+    return reference_data.snapshot
+
+
+def update_application_counts(session, application, total=0, cancelled=0):
+    increment_counters(session, job_application_daily_count, ["job_listing_id", "day"], [{
+        "job_listing_id": application.job_listing_id,
+        "day": application.created.date(),
+        "total": total,
+        "cancelled": cancelled,
+    }])
+
+
+def fast_response(content):
+    return ORJSONResponse(content) if FAST_RESPONSES else content
+
 
 @router.get("/skills", response_model=ListSkills)
 async def get_skills(
         page: conint(ge=1) = 1,
         perPage: conint(ge=1, le=100) = 1,
         sortByOrder: SortByOrder = SortByOrder.ascending,
+        after: Optional[str] = None,
 ):
-    with session_maker() as session:
-        query = session.query(Skill)
-        sorting_order = desc if sortByOrder.value == SortByOrder.descending.value else asc
-        skills = query.order_by(sorting_order(Skill.name))
-        offset = (page - 1) * perPage if page > 1 else None
+    rows = list((await load_reference_data()).skills.values())
+    skills, next_cursor = paginate_rows(
+        rows,
+        columns=(Skill.name, Skill.id),
+        descending=sortByOrder.value == SortByOrder.descending.value,
+        per_page=perPage,
+        page=page,
+        after=after,
+    )
     return {
-        "skills": [skill.dict() for skill in skills.limit(perPage).offset(offset)],
-        "pages": skills.count() / perPage,
+        "skills": [skill._asdict() for skill in skills],
+        "pages": count_row_pages(rows, perPage, count_strategies["skills"]),
+        "nextCursor": next_cursor,
     }
 
 
@@ -42,28 +150,43 @@ async def get_locations(
         page: conint(ge=1) = 1,
         perPage: conint(ge=1, le=100) = 1,
         sortByOrder: SortByOrder = SortByOrder.ascending,
+        after: Optional[str] = None,
 ):
-    with session_maker() as session:
-        query = session.query(Location)
-        sorting_order = desc if sortByOrder.value == SortByOrder.descending.value else asc
-        locations = query.order_by(sorting_order(Location.country)).order_by(sorting_order(Location.city))
-        offset = (page - 1) * perPage if page > 1 else None
+    rows = list((await load_reference_data()).locations.values())
+    locations, next_cursor = paginate_rows(
+        rows,
+        columns=(Location.country, Location.city, Location.id),
+        descending=sortByOrder.value == SortByOrder.descending.value,
+        per_page=perPage,
+        page=page,
+        after=after,
+    )
     return {
-        "locations": [location.dict() for location in locations.limit(perPage).offset(offset)],
-        "pages": locations.count() / perPage,
+        "locations": [location._asdict() for location in locations],
+        "pages": count_row_pages(rows, perPage, count_strategies["locations"]),
+        "nextCursor": next_cursor,
     }
 
 
 @router.post("/applications", response_model=GetJobApplication)
 async def apply_for_job(request: Request, job: CreateJobApplication):
-    with session_maker() as session:
+    def create_application(session):
+        if session.query(Job.id).filter(Job.id == job.job_id).first() is None:
+            raise HTTPException(
+                status_code=404, detail=f"Job listing with ID {job.job_id} not found"
+            )
         application = JobApplication(
             candidate_id=request.state.user_id or 1,
             job_listing_id=job.job_id,
         )
         session.add(application)
+        session.flush()
+        update_application_counts(session, application, total=1)
         session.commit()
-        return application.dict()
+        count_cache.invalidate(JobApplication.__tablename__)
+        return serialize_application(application, load_skill_names(session, [job.job_id])[job.job_id])
+
+    return await run_in_session(create_application)
 
 
 @router.get("/applications", response_model=ListJobApplications)
@@ -71,22 +194,35 @@ async def list_applications(
         page: conint(ge=1) = 1,
         perPage: conint(ge=1, le=100) = 1,
         sortByOrder: SortByOrder = SortByOrder.ascending,
+        after: Optional[str] = None,
 ):
-    with session_maker() as session:
-        query = session.query(JobApplication)
-        sorting_order = desc if sortByOrder.value == SortByOrder.descending.value else asc
-        applications = query.order_by(sorting_order(JobApplication.created))
-        offset = (page - 1) * perPage if page > 1 else None
-    return {
-        "applications": [application.dict() for application in applications.limit(perPage).offset(offset)],
-        "pages": applications.count() / perPage,
-    }
+    def query_applications(session):
+        query = session.query(JobApplication).options(*application_loading_options)
+        applications, next_cursor = paginate(
+            query,
+            columns=(JobApplication.created, JobApplication.id),
+            descending=sortByOrder.value == SortByOrder.descending.value,
+            per_page=perPage,
+            page=page,
+            after=after,
+        )
+        skills = load_skill_names(session, {application.job_listing_id for application in applications})
+        return {
+            "applications": [
+                serialize_application(application, skills[application.job_listing_id])
+                for application in applications
+            ],
+            "pages": count_pages(query, JobApplication.id, perPage, count_strategies["applications"]),
+            "nextCursor": next_cursor,
+        }
+
+    return fast_response(await run_in_session(query_applications))
 
 
 @router.get("/applications/{application_id}", response_model=GetJobApplication)
 async def get_application(application_id: int, request: Request):
-    with session_maker() as session:
-        application = session.query(JobApplication).filter(
+    def query_application(session):
+        application = session.query(JobApplication).options(*application_loading_options).filter(
             JobApplication.id == application_id,
             JobApplication.candidate_id == request.state.user_id
         ).first()
@@ -95,12 +231,16 @@ async def get_application(application_id: int, request: Request):
                 status_code=404,
                 detail=f"Job application with ID {application_id} not Found",
             )
-        return application.dict()
+        return serialize_application(
+            application, load_skill_names(session, [application.job_listing_id])[application.job_listing_id]
+        )
+
+    return fast_response(await run_in_session(query_application))
 
 
 @router.post("/applications/{application_id}/cancel", response_model=GetJobApplication)
 async def cancel_application(application_id: int, request: Request):
-    with session_maker() as session:
+    def update_application(session):
         application = session.query(JobApplication).filter(
             JobApplication.id == application_id,
             JobApplication.candidate_id == request.state.user_id
@@ -110,9 +250,16 @@ async def cancel_application(application_id: int, request: Request):
                 status_code=404,
                 detail=f"Job application with ID {application_id} not Found",
             )
-        application.cancelled = True
+        if not application.cancelled:
+            application.cancelled = True
+            update_application_counts(session, application, cancelled=1)
         session.commit()
-        return application.dict()
+        count_cache.invalidate(JobApplication.__tablename__)
+        return serialize_application(
+            application, load_skill_names(session, [application.job_listing_id])[application.job_listing_id]
+        )
+
+    return await run_in_session(update_application)
 
 
 @router.get("/jobs", response_model=ListJobsSchema)
@@ -123,27 +270,165 @@ async def get_jobs(
         perPage: conint(ge=1, le=100) = 1,
         sortBy: SortByEnum = SortByEnum.datePosted,
         sortByOrder: SortByOrder = SortByOrder.descending,
+        after: Optional[str] = None,
 ):
-    with session_maker() as session:
-        query = session.query(Job)
+    def list_jobs(session):
+        filters = [job_card.c.visible == True]
         if dateSincePosted:
-            query = query.filter(Job.date_posted >= dateSincePosted)
+            filters.append(job_card.c.date_posted >= dateSincePosted)
         if contractType:
-            query = query.filter(Job.contract_type == contractType.value)
-        sort_by_order = desc if sortByOrder.value == SortByOrder.descending.value else asc
-        sort_by = getattr(Job, "date_posted") if sortBy == SortByEnum.datePosted else getattr(Job, "rate_annualized")
-        jobs = query.order_by(sort_by_order(sort_by))
-        offset = (page - 1) * perPage if page > 1 else None
+            filters.append(job_card.c.contract_type == contractType.value)
+        sort_by = job_card.c.date_posted if sortBy == SortByEnum.datePosted else job_card.c.rate_annualized
+        cards, next_cursor = paginate(
+            session.query(job_card.c.id, sort_by, job_card.c.document).filter(*filters),
+            columns=(sort_by, job_card.c.id),
+            descending=sortByOrder.value == SortByOrder.descending.value,
+            per_page=perPage,
+            page=page,
+            after=after,
+        )
+        pages = count_pages(
+            session.query(job_card.c.id).filter(*filters), job_card.c.id, perPage, count_strategies["jobs"]
+        )
+        return [card.document for card in cards], pages, next_cursor
+
+    documents, pages, next_cursor = await run_in_session(list_jobs)
+    if FAST_RESPONSES:
+        # The cards are already JSON, so they are spliced in rather than parsed and encoded again
+        return Response(
+            b'{"jobs":[' + b",".join(document.encode() for document in documents) + b'],"pages":'
+            + orjson.dumps(pages) + b',"nextCursor":' + orjson.dumps(next_cursor) + b"}",
+            media_type="application/json",
+        )
     return {
-        "jobs": [job.dict() for job in jobs.limit(perPage).offset(offset)],
-        "pages": jobs.count() / perPage,
+        "jobs": [orjson.loads(document) for document in documents],
+        "pages": pages,
+        "nextCursor": next_cursor,
     }
 
 
+@router.get("/jobs:export")
+async def export_jobs(
+        dateSincePosted: Optional[date] = None,
+        contractType: Optional[ContractTypeEnum] = None,
+        format: ExportFormatEnum = ExportFormatEnum.ndjson,
+):
+    filters = [Job.visible == True]
+    if dateSincePosted:
+        filters.append(Job.date_posted >= dateSincePosted)
+    if contractType:
+        filters.append(Job.contract_type == contractType.value)
+
+    def read_jobs(session):
+        rows = iter(
+            query_job_listings(session).filter(*filters).order_by(Job.id)
+            .execution_options(stream_results=True).yield_per(JOBS_EXPORT_BATCH_SIZE)
+        )
+        while batch := list(islice(rows, JOBS_EXPORT_BATCH_SIZE)):
+            skills = load_skill_names(session, [row.id for row in batch])
+            yield [serialize_job(row, skills[row.id]) for row in batch]
+
+    media_type, encode, header = export_formats[format]
+
+    async def stream_jobs():
+        if header:
+            yield header
+        async for jobs in stream_in_session(read_jobs):
+            yield encode(jobs)
+
+    return StreamingResponse(
+        stream_jobs(),
+        media_type=media_type,
+        headers={"content-disposition": f"attachment; filename=jobs.{format.value}"},
+    )
+
+
+# Registered before /jobs/{job_id}, which would otherwise reject "search" as an id
+@router.get("/jobs/search", response_model=ListJobsSchema)
+async def search_job_listings(
+        q: str,
+        dateSincePosted: Optional[date] = None,
+        contractType: Optional[ContractTypeEnum] = None,
+        page: conint(ge=1) = 1,
+        perPage: conint(ge=1, le=100) = 10,
+        after: Optional[str] = None,
+):
+    def find_jobs(session):
+        filters = [Job.visible == True]
+        if dateSincePosted:
+            filters.append(Job.date_posted >= dateSincePosted)
+        if contractType:
+            filters.append(Job.contract_type == contractType.value)
+        query, rank = search_jobs(session, query_job_listings(session).filter(*filters), q)
+        jobs, next_cursor = paginate(
+            query.add_columns(rank),
+            columns=(rank, Job.id),
+            descending=False,
+            per_page=perPage,
+            page=page,
+            after=after,
+        )
+        skills = load_skill_names(session, [job.id for job in jobs])
+        count_query, _ = search_jobs(session, session.query(Job).filter(*filters), q)
+        return {
+            "jobs": [serialize_job(job, skills[job.id]) for job in jobs],
+            "pages": count_pages(count_query, Job.id, perPage, count_strategies["search"]),
+            "nextCursor": next_cursor,
+        }
+
+    return fast_response(await run_in_session(find_jobs))
+
+
+@router.get("/jobs/facets", response_model=JobFacets)
+async def get_job_facets():
+    def count_facets(session):
+        # Buckets of past days only hold jobs the expiry sweeper hasn't hidden yet
+        counts = session.query(
+            job_facet_count.c.facet, job_facet_count.c.value, func.sum(job_facet_count.c.job_count)
+        ).filter(
+            job_facet_count.c.live_until_day >= datetime.utcnow().date()
+        ).group_by(
+            job_facet_count.c.facet, job_facet_count.c.value
+        ).having(func.sum(job_facet_count.c.job_count) > 0).all()
+        facets = defaultdict(dict)
+        for facet, value, job_count in counts:
+            facets[facet][value] = job_count
+        reference = reference_data.snapshot
+        # In id order, so equal counts keep a stable order
+        locations = [
+            reference.locations[location_id] for location_id in sorted(map(int, facets["location"]))
+            if location_id in reference.locations
+        ]
+        skills = [
+            reference.skills[skill_id] for skill_id in sorted(map(int, facets["skill"])) if skill_id in reference.skills
+        ]
+        return {
+            "contractTypes": sorted(
+                ({"value": value, "count": job_count} for value, job_count in facets["contractType"].items()),
+                key=itemgetter("count"),
+                reverse=True,
+            ),
+            "locations": sorted(
+                ({**location._asdict(), "count": facets["location"][str(location.id)]} for location in locations),
+                key=itemgetter("count"),
+                reverse=True,
+            ),
+            "skills": sorted(
+                ({**skill._asdict(), "count": facets["skill"][str(skill.id)]} for skill in skills),
+                key=itemgetter("count"),
+                reverse=True,
+            ),
+        }
+
+    return await run_in_session(count_facets)
+
+
 def calculate_annualized_rate(rate, per_time):
     if per_time == AmountPerTimeEnum.hour.value:
         # assume 255 working days in a year
         return rate * 8 * 255
+    elif per_time == AmountPerTimeEnum.day.value:
+        return rate * 255
     elif per_time == AmountPerTimeEnum.month.value:
         # assume 11 working months
         return rate * 11
@@ -155,108 +440,351 @@ def calculate_annualized_rate(rate, per_time):
 
 @router.post("/jobs", response_model=GetJobSchema, status_code=status.HTTP_201_CREATED)
 async def create_job(job_details: CreateJobSchema):
-    with session_maker() as session:
+    reference = await check_job_references(job_details)
+
+    def insert_job(session):
+        skill_ids = job_skill_ids(job_details)
         job = Job(
-            hirer_id=1,
-            recruiter_id=1,
+            hirer_id=job_details.hirer,
+            recruiter_id=reference.hirer_recruiters[job_details.hirer],
             title=job_details.title,
             rate=job_details.rate.amount,
-            rate_per_time_unit=job_details.rate.amountPerTime,
+            rate_per_time_unit=job_details.rate.amountPerTime.value,
             rate_annualized=calculate_annualized_rate(
-                job_details.rate.amount, job_details.rate.amountPerTime
+                job_details.rate.amount, job_details.rate.amountPerTime.value
             ),
             benefits=job_details.benefits,
-            contract_type=job_details.contractType,
+            contract_type=job_details.contractType.value,
             description=job_details.description,
             date_posted=datetime.today().date(),
             live_until=job_details.liveUntil,
             location_id=job_details.location,
-            skills=session.query(Skill).filter(
-                Skill.id.in_(job_details.skills)
-            ).all()
+            visible=True,
         )
+        session.add(job)
+        session.flush()
+        add_job_skills(session, job.id, skill_ids)
+        update_facet_counts(session, added=job_facet_keys(job, skill_ids))
+        document = save_job_card(session, job.id, skill_names(skill_ids))
         session.commit()
-        return job.dict()
+        count_cache.invalidate(Job.__tablename__, job_card.name)
+        job_match_index.invalidate()
+        invalidate_responses("jobs")
+        return document
+
+    return await run_in_session(insert_job)
+
+
+@router.post("/jobs:batch")
+async def create_jobs_batch(request: Request):
+    report = BatchReport()
+
+    def check_references(chunk):
+        reference = reference_data.snapshot
+        refreshed = False
+        jobs, skills = [], []
+        for index, job_details in chunk:
+            errors = job_reference_errors(job_details, reference)
+            if errors and not refreshed:
+                # Reload once per chunk for references written since the last reload
+                reference, refreshed = reference_data.refresh(), True
+                errors = job_reference_errors(job_details, reference)
+            try:
+                rate_annualized = calculate_annualized_rate(
+                    job_details.rate.amount, job_details.rate.amountPerTime.value
+                )
+            except Exception as error:
+                errors.append({"loc": ["rate", "amountPerTime"], "msg": str(error)})
+            if errors:
+                report.fail(index, errors)
+                continue
+            jobs.append((index, {
+                "hirer_id": job_details.hirer,
+                "recruiter_id": reference.hirer_recruiters[job_details.hirer],
+                "title": job_details.title,
+                "rate": job_details.rate.amount,
+                "rate_per_time_unit": job_details.rate.amountPerTime.value,
+                "rate_annualized": rate_annualized,
+                "benefits": job_details.benefits,
+                "contract_type": job_details.contractType.value,
+                "description": job_details.description,
+                "live_until": job_details.liveUntil,
+                "location_id": job_details.location,
+            }))
+            skills.append(set(job_skill_ids(job_details)))
+        return jobs, skills
+
+    def insert_chunk(session, chunk):
+        jobs, skills = check_references(chunk)
+        if not jobs:
+            return
+        for attempt in range(3):
+            try:
+                job_ids = bulk_insert(session, Job.__table__, [job for _, job in jobs])
+                session.execute(skills_job_association.insert(), [
+                    {"job": job_id, "skill": skill_id}
+                    for job_id, skill_set in zip(job_ids, skills) for skill_id in skill_set
+                ])
+                update_facet_counts(session, added=[
+                    key
+                    for (_, job), skill_set in zip(jobs, skills)
+                    for key in facet_keys(job["contract_type"], job["location_id"], skill_set, job["live_until"])
+                ])
+                save_job_cards(session, {
+                    job_id: skill_names(sorted(skill_set)) for job_id, skill_set in zip(job_ids, skills)
+                })
+                session.commit()
+                break
+            except IntegrityError:
+                # Another writer took the preallocated ids first
+                session.rollback()
+                if attempt == 2:
+                    raise
+        for (index, _), job_id in zip(jobs, job_ids):
+            report.succeed(index, job_id)
+
+    chunk = []
+    async for index, job_details, errors in read_items(request, CreateJobSchema):
+        if errors:
+            report.fail(index, errors)
+            continue
+        chunk.append((index, job_details))
+        if len(chunk) >= JOBS_BATCH_CHUNK_SIZE:
+            await run_in_session(insert_chunk, chunk)
+            chunk = []
+    if chunk:
+        await run_in_session(insert_chunk, chunk)
+
+    if report.created:
+        count_cache.invalidate(Job.__tablename__, job_card.name)
+        job_match_index.invalidate()
+        invalidate_responses("jobs")
+    return ORJSONResponse(report.dict())
 
 
 @router.get("/jobs/{job_id}", response_model=GetJobSchema)
 async def get_job(job_id: int):
-    with session_maker() as session:
-        job = session.query(Job).filter(Job.id == job_id).first()
+    def query_job(session):
+        job = session.query(*job_listing_columns).filter(Job.id == job_id).first()
         if job:
-            return job.dict()
-    raise HTTPException(
-        status_code=404, detail=f"Job listing with ID {job_id} not found"
-    )
+            return serialize_job(job, load_skill_names(session, [job_id])[job_id])
+        raise HTTPException(
+            status_code=404, detail=f"Job listing with ID {job_id} not found"
+        )
+
+    return fast_response(await run_in_session(query_job))
 
 
 @router.put("/jobs/{job_id}", response_model=GetJobSchema)
 async def update_job(job_id: int, job_details: CreateJobSchema):
-    with session_maker() as session:
+    reference = await check_job_references(job_details)
+
+    def update_listing(session):
         job = session.query(Job).filter(Job.id == job_id).first()
         if job is None:
             raise HTTPException(
                 status_code=404, detail=f"Job listing with ID {job_id} not found"
             )
-        job.title = job_details.title,
-        job.contract_type = job_details.contractType
-        job.rate = job_details.rate.amount,
-        job.rate_per_time_unit = job_details.rate.amountPerTime,
+        previous_facets = job_facet_keys(job)
+        skill_ids = job_skill_ids(job_details)
+        job.title = job_details.title
+        job.contract_type = job_details.contractType.value
+        job.rate = job_details.rate.amount
+        job.rate_per_time_unit = job_details.rate.amountPerTime.value
         job.rate_annualized = calculate_annualized_rate(
-            job_details.rate.amount, job_details.rate.amountPerTime
+            job_details.rate.amount, job_details.rate.amountPerTime.value
         )
-        job.benefits = job_details.benefits,
-        job.location_id = job_details.location,
-        job.description = job_details.description,
-        job.hirer_id = job_details.hirer,
+        job.benefits = job_details.benefits
+        job.location_id = job_details.location
+        job.description = job_details.description
+        job.hirer_id = job_details.hirer
+        job.recruiter_id = reference.hirer_recruiters[job_details.hirer]
         job.live_until = job_details.liveUntil
-        job.skills = session.query(Skill).filter(
-            Skill.id.in_(job_details.skills)
-        ).all()
+        session.execute(skills_job_association.delete().where(skills_job_association.c.job == job.id))
+        add_job_skills(session, job.id, skill_ids)
+        update_facet_counts(session, added=job_facet_keys(job, skill_ids), removed=previous_facets)
+        document = save_job_card(session, job.id, skill_names(skill_ids))
         session.commit()
-        return job.dict()
+        count_cache.invalidate(Job.__tablename__, job_card.name)
+        job_match_index.invalidate()
+        invalidate_responses("jobs", f"job:{job_id}")
+        return document
+
+    return await run_in_session(update_listing)
 
 
 @router.delete("/jobs/{job_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
-async def delete_job(job_id: uuid.UUID):
-    with session_maker() as session:
-        job = session.query(Job).filter(Job.id == job_id)
+async def delete_job(job_id: int):
+    def delete_listing(session):
+        job = session.query(Job).filter(Job.id == job_id).first()
         if job is None:
             raise HTTPException(
                 status_code=404, detail=f"Job listing with ID {job_id} not found"
             )
+        if session.query(JobApplication.id).filter(JobApplication.job_listing_id == job_id).first() is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job listing with ID {job_id} has applications, cancel it instead",
+            )
+        update_facet_counts(session, removed=job_facet_keys(job))
+        delete_job_card(session, job_id)
+        session.execute(
+            job_application_daily_count.delete().where(job_application_daily_count.c.job_listing_id == job_id)
+        )
         session.delete(job)
         session.commit()
-        return
+        count_cache.invalidate(Job.__tablename__, job_card.name)
+        job_match_index.invalidate()
+        invalidate_responses("jobs", f"job:{job_id}")
+
+    await run_in_session(delete_listing)
 
 
 @router.post("/jobs/{job_id}/cancel", response_model=GetJobSchema, status_code=status.HTTP_201_CREATED)
-async def cancel_job(job_id: uuid.UUID):
-    with session_maker() as session:
-        job = session.query(Job).filter(Job.id == job_id)
+async def cancel_job(job_id: int):
+    def hide_job(session):
+        job = session.query(Job).filter(Job.id == job_id).first()
         if job is None:
             raise HTTPException(
                 status_code=404, detail=f"Job listing with ID {job_id} not found"
             )
+        skills = [skill.name for skill in job.skills]
+        update_facet_counts(session, removed=job_facet_keys(job))
         job.visible = False
+        set_job_card_visibility(session, [job_id], False)
         session.commit()
-        return job.dict()
+        count_cache.invalidate(Job.__tablename__, job_card.name)
+        job_match_index.invalidate()
+        invalidate_responses("jobs", f"job:{job_id}")
+        return serialize_job(job, skills)
+
+    return await run_in_session(hide_job)
 
 
 @router.post("/jobs/{job_id}/reactivate", response_model=GetJobSchema, status_code=status.HTTP_201_CREATED)
-async def reactivate_job(job_id: uuid.UUID):
-    with session_maker() as session:
-        job = session.query(Job).filter(Job.id == job_id)
+async def reactivate_job(job_id: int):
+    def show_job(session):
+        job = session.query(Job).filter(Job.id == job_id).first()
         if job is None:
             raise HTTPException(
                 status_code=404, detail=f"Job listing with ID {job_id} not found"
             )
+        if job.live_until <= datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job listing with ID {job_id} has expired, update its liveUntil instead",
+            )
+        skills = [skill.name for skill in job.skills]
+        previous_facets = job_facet_keys(job)
         job.visible = True
+        update_facet_counts(session, added=job_facet_keys(job), removed=previous_facets)
+        set_job_card_visibility(session, [job_id], True)
         session.commit()
-        return job.dict()
+        count_cache.invalidate(Job.__tablename__, job_card.name)
+        job_match_index.invalidate()
+        invalidate_responses("jobs", f"job:{job_id}")
+        return serialize_job(job, skills)
+
+    return await run_in_session(show_job)
+
+
+@router.get("/candidates/{candidate_id}/matches", response_model=ListJobMatches)
+async def get_candidate_matches(
+        candidate_id: int,
+        limit: conint(ge=1, le=100) = 20,
+        weighted: bool = True,
+):
+    def find_matches(session):
+        if session.query(Candidate.id).filter(Candidate.id == candidate_id).first() is None:
+            raise HTTPException(
+                status_code=404, detail=f"Candidate with ID {candidate_id} not found"
+            )
+        candidate_skills = session.query(
+            skills_candidate_association.c.skill, skills_candidate_association.c.years_experience
+        ).filter(skills_candidate_association.c.candidate == candidate_id).all()
+        # Some top ranked jobs may have expired or been hidden since the last rebuild
+        ranked = job_match_index.match(candidate_skills, limit * 2, weighted=weighted)
+        jobs = {
+            job.id: job for job in query_job_listings(session).filter(
+                Job.id.in_([job_id for job_id, _ in ranked]),
+                Job.visible == True,
+            )
+        }
+        skills = load_skill_names(session, list(jobs))
+        candidate_skill_names = {reference_data.skill(skill).name for skill, _ in candidate_skills}
+        matches = [
+            {
+                "job": serialize_job(jobs[job_id], skills[job_id]),
+                "score": score,
+                "matchedSkills": [name for name in skills[job_id] if name in candidate_skill_names],
+            }
+            for job_id, score in ranked if job_id in jobs
+        ]
+        return {"matches": matches[:limit]}
+
+    if not job_match_index.ready:
+        await anyio.to_thread.run_sync(job_match_index.refresh)
+    return fast_response(await run_in_session(find_matches))
 
 
 # job applications endpoints for recruiters
-@router.get("/jobs/{job_id}/applications")
-async def list_job_applications():
-    pass
+@router.get("/jobs/{job_id}/applications", response_model=ListJobApplicants)
+async def list_job_applications(
+        job_id: int,
+        cancelled: Optional[bool] = None,
+        page: conint(ge=1) = 1,
+        perPage: conint(ge=1, le=100) = 20,
+        sortByOrder: SortByOrder = SortByOrder.descending,
+        after: Optional[str] = None,
+        stats: bool = False,
+):
+    def query_job_applications(session):
+        if session.query(Job.id).filter(Job.id == job_id).first() is None:
+            raise HTTPException(
+                status_code=404, detail=f"Job listing with ID {job_id} not found"
+            )
+        query = session.query(
+            JobApplication.id,
+            JobApplication.created,
+            JobApplication.cancelled,
+            Candidate.id.label("candidate_id"),
+            Candidate.name,
+        ).outerjoin(JobApplication.candidate).filter(JobApplication.job_listing_id == job_id)
+        if cancelled is not None:
+            query = query.filter(JobApplication.cancelled == cancelled)
+        applications, next_cursor = paginate(
+            query,
+            columns=(JobApplication.id,),
+            descending=sortByOrder.value == SortByOrder.descending.value,
+            per_page=perPage,
+            page=page,
+            after=after,
+        )
+        # Counts come from the daily summary, not a COUNT over the applications
+        daily = session.query(
+            job_application_daily_count.c.day,
+            job_application_daily_count.c.total,
+            job_application_daily_count.c.cancelled,
+        ).filter(
+            job_application_daily_count.c.job_listing_id == job_id
+        ).order_by(job_application_daily_count.c.day).all()
+        total = sum(day.total for day in daily)
+        total_cancelled = sum(day.cancelled for day in daily)
+        if cancelled is None:
+            matching = total
+        else:
+            matching = total_cancelled if cancelled else total - total_cancelled
+        return {
+            "applications": [serialize_applicant_row(application) for application in applications],
+            "pages": max(1, math.ceil(matching / perPage)),
+            "nextCursor": next_cursor,
+            "stats": {
+                "total": total,
+                "cancelled": total_cancelled,
+                "perDay": [
+                    {"day": day.day, "total": day.total, "cancelled": day.cancelled} for day in daily
+                ],
+            } if stats else None,
+        }
+
+    return fast_response(await run_in_session(query_job_applications))
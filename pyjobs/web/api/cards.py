@@ -0,0 +1,123 @@
+"""Job listings as they are read, and the `job_card` read model built from them.
+
+Every handler that writes a job rewrites its card in the same transaction,
+so GET /jobs reads one table and hands the stored documents out as they
+are. Cards embed the location, hirer, recruiter and skill names of the
+time they were written: after renaming any of those, or writing jobs
+around the API handlers, run backfill_job_cards.py.
+"""
+from collections import defaultdict
+
+import orjson
+from sqlalchemy import select
+
+from pyjobs.models.counters import UPSERT_DIALECTS
+from pyjobs.models.models import Job, job_card, skills_job_association
+from pyjobs.models.reference import reference_data
+from pyjobs.web.api.serializers import serialize_job
+
+# Only what GetJobSchema and the card need; listings read plain rows instead of
+# ORM entities, and serialize_job looks up the location, hirer and recruiter in reference_data
+job_listing_columns = (
+    Job.id,
+    Job.title,
+    Job.date_posted,
+    Job.rate,
+    Job.rate_per_time_unit,
+    Job.rate_annualized,
+    Job.benefits,
+    Job.contract_type,
+    Job.live_until,
+    Job.location_id,
+    Job.hirer_id,
+    Job.recruiter_id,
+    Job.visible,
+)
+
+
+def query_job_listings(session):
+    return session.query(*job_listing_columns)
+
+
+def load_skill_names(session, job_ids):
+    skills = defaultdict(list)
+    rows = session.query(skills_job_association.c.job, skills_job_association.c.skill).filter(
+        skills_job_association.c.job.in_(job_ids)
+    )
+    for job_id, skill_id in rows:
+        skills[job_id].append(reference_data.skill(skill_id).name)
+    return skills
+
+
+def job_card_row(job, document):
+    return {
+        "id": job.id,
+        "date_posted": job.date_posted,
+        "rate_annualized": job.rate_annualized,
+        "contract_type": job.contract_type,
+        "visible": job.visible,
+        "document": orjson.dumps(document).decode(),
+    }
+
+
+def write_job_cards(session, rows):
+    if not rows:
+        return
+    upsert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        statement = upsert(job_card)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["id"],
+                set_={column: statement.excluded[column] for column in rows[0] if column != "id"},
+            ),
+            rows,
+        )
+        return
+    session.execute(job_card.delete().where(job_card.c.id.in_([row["id"] for row in rows])))
+    session.execute(job_card.insert(), rows)
+
+
+def save_job_cards(session, skills):
+    """Rewrites the cards of the jobs in ``skills``, a dict of job ids to skill names.
+
+    The jobs are read back as flushed in this transaction, so the returned
+    documents, by job id, match what GET /jobs will serve for them.
+    """
+    jobs = query_job_listings(session).filter(Job.id.in_(list(skills))).all()
+    documents = {job.id: serialize_job(job, skills[job.id]) for job in jobs}
+    write_job_cards(session, [job_card_row(job, documents[job.id]) for job in jobs])
+    return documents
+
+
+def save_job_card(session, job_id, skills):
+    return save_job_cards(session, {job_id: skills})[job_id]
+
+
+def set_job_card_visibility(session, job_ids, visible):
+    session.execute(job_card.update().where(job_card.c.id.in_(job_ids)).values(visible=visible))
+
+
+def delete_job_card(session, job_id):
+    session.execute(job_card.delete().where(job_card.c.id == job_id))
+
+
+def backfill_job_cards(session, batch_size=1000):
+    """Rewrites every job's card, committing every ``batch_size`` jobs.
+
+    Drops the cards of jobs that no longer exist first. Yields the number
+    of cards written by each batch.
+    """
+    session.execute(job_card.delete().where(job_card.c.id.notin_(select(Job.id))))
+    session.commit()
+    last_id = 0
+    while True:
+        jobs = query_job_listings(session).filter(Job.id > last_id).order_by(Job.id).limit(batch_size).all()
+        if not jobs:
+            return
+        skills = load_skill_names(session, [job.id for job in jobs])
+        write_job_cards(session, [job_card_row(job, serialize_job(job, skills[job.id])) for job in jobs])
+        session.commit()
+        last_id = jobs[-1].id
+        yield len(jobs)
+
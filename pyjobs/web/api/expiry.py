@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from pyjobs.matching import job_match_index
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import Job, job_card, skills_job_association
+from pyjobs.web.api.cards import set_job_card_visibility
+from pyjobs.web.api.facets import facet_keys, update_facet_counts
+from pyjobs.web.api.pagination import count_cache
+from pyjobs.web.cache import invalidate_responses
+
+logger = logging.getLogger(__name__)
+
+
+class ExpirySweeper:
+    """Hides visible jobs once their ``live_until`` has passed.
+
+    Every ``interval`` seconds a background thread finds expired jobs through
+    the ``(visible, live_until)`` index and hides them ``batch_size`` at a
+    time, updating each batch's jobs, cards and facet counters in one
+    transaction. Listings then only filter on ``visible``, and show a job for
+    at most ``interval`` seconds after it expires. An ``interval`` of 0 turns
+    the thread off, e.g. for every worker but one.
+    """
+
+    def __init__(self, interval=60, batch_size=500):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def hide_batch(self, session, now):
+        """Hides up to ``batch_size`` jobs that expired by ``now`` and returns their ids."""
+        jobs = session.query(Job.id, Job.contract_type, Job.location_id, Job.live_until).filter(
+            Job.visible == True, Job.live_until <= now
+        ).order_by(Job.live_until).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        if not jobs:
+            return []
+        job_ids = [job.id for job in jobs]
+        skills = defaultdict(list)
+        for job_id, skill_id in session.query(skills_job_association.c.job, skills_job_association.c.skill).filter(
+            skills_job_association.c.job.in_(job_ids)
+        ):
+            skills[job_id].append(skill_id)
+        session.query(Job).filter(Job.id.in_(job_ids)).update({Job.visible: False}, synchronize_session=False)
+        set_job_card_visibility(session, job_ids, False)
+        update_facet_counts(session, removed=[
+            key
+            for job in jobs
+            for key in facet_keys(job.contract_type, job.location_id, skills[job.id], job.live_until)
+        ])
+        return job_ids
+
+    def sweep(self):
+        """Hides every job that has expired by now and returns how many it hid."""
+        now = datetime.utcnow()
+        start = time.monotonic()
+        hidden = batches = 0
+        while not self._stop.is_set():
+            batch_start = time.monotonic()
+            with session_maker() as session:
+                job_ids = self.hide_batch(session, now)
+                session.commit()
+            if not job_ids:
+                break
+            hidden += len(job_ids)
+            batches += 1
+            count_cache.invalidate(Job.__tablename__, job_card.name)
+            invalidate_responses("jobs")
+            logger.info("Hid a batch of %d expired jobs in %.3fs", len(job_ids), time.monotonic() - batch_start)
+            if len(job_ids) < self.batch_size:
+                break
+        if hidden:
+            job_match_index.invalidate()
+            logger.info("Hid %d expired jobs in %d batches in %.3fs", hidden, batches, time.monotonic() - start)
+        return hidden
+
+    def _safe_sweep(self):
+        try:
+            self.sweep()
+        except Exception:
+            logger.exception("Failed to hide expired jobs")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._safe_sweep()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if not self.interval or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="expiry-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+expiry_sweeper = ExpirySweeper(
+    interval=float(os.getenv("EXPIRY_SWEEP_INTERVAL", "60")),
+    batch_size=int(os.getenv("EXPIRY_SWEEP_BATCH_SIZE", "500")),
+)
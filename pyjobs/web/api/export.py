@@ -0,0 +1,64 @@
+import csv
+import io
+
+import orjson
+
+from pyjobs.web.api.schemas import ExportFormatEnum
+
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "dateListed",
+    "rate",
+    "amountPerTime",
+    "benefits",
+    "city",
+    "state",
+    "country",
+    "hirer",
+    "recruiterName",
+    "recruiterEmail",
+    "contractType",
+    "skills",
+    "liveUntil",
+)
+
+
+def encode_ndjson(jobs):
+    return b"".join(orjson.dumps(job, option=orjson.OPT_APPEND_NEWLINE) for job in jobs)
+
+
+def encode_csv(jobs):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for job in jobs:
+        writer.writerow((
+            job["id"],
+            job["title"],
+            job["dateListed"].isoformat(),
+            job["rate"]["amount"],
+            job["rate"]["amountPerTime"],
+            job["benefits"],
+            job["location"]["city"],
+            job["location"].get("state", ""),
+            job["location"]["country"],
+            job["hirer"],
+            job["recruiter"]["name"],
+            job["recruiter"]["email"],
+            job["contractType"],
+            ";".join(job["skills"]),
+            job["liveUntil"].isoformat(),
+        ))
+    return buffer.getvalue().encode()
+
+
+def csv_header():
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+export_formats = {
+    ExportFormatEnum.ndjson: ("application/x-ndjson", encode_ndjson, b""),
+    ExportFormatEnum.csv: ("text/csv", encode_csv, csv_header()),
+}
@@ -0,0 +1,45 @@
+from collections import Counter
+
+from sqlalchemy.orm import selectinload
+
+from pyjobs.models.counters import increment_counters
+from pyjobs.models.models import Job, job_facet_count
+
+
+def facet_keys(contract_type, location_id, skill_ids, live_until):
+    day = live_until.date()
+    return [
+        ("contractType", contract_type, day),
+        ("location", str(location_id), day),
+        *(("skill", str(skill_id), day) for skill_id in skill_ids),
+    ]
+
+
+def job_facet_keys(job, skill_ids=None):
+    if not job.visible:
+        return []
+    if skill_ids is None:
+        skill_ids = [skill.id for skill in job.skills]
+    return facet_keys(job.contract_type, job.location_id, skill_ids, job.live_until)
+
+
+def update_facet_counts(session, added=(), removed=()):
+    """Adds one to the counters for ``added`` keys and takes one from ``removed``.
+
+    Runs in the caller's transaction, so the counters commit or roll back
+    together with the job write that changed them.
+    """
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    rows = [
+        {"facet": facet, "value": value, "live_until_day": day, "job_count": delta}
+        for (facet, value, day), delta in deltas.items() if delta
+    ]
+    increment_counters(session, job_facet_count, ["facet", "value", "live_until_day"], rows)
+
+
+def rebuild_facet_counts(session):
+    """Recounts every visible job, for data written around the API handlers."""
+    session.execute(job_facet_count.delete())
+    jobs = session.query(Job).options(selectinload(Job.skills)).filter(Job.visible == True)
+    update_facet_counts(session, added=[key for job in jobs for key in job_facet_keys(job)])
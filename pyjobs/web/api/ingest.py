@@ -0,0 +1,106 @@
+import json
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, select, text
+from starlette import status
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonlines", "application/jsonl")
+
+
+def _validate(schema, parse, item):
+    try:
+        return parse(item), None
+    except ValidationError as error:
+        # ctx can echo the whole item back and isn't always JSON serializable
+        return None, [
+            {"loc": list(detail["loc"]), "msg": detail["msg"], "type": detail["type"]}
+            for detail in error.errors()
+        ]
+
+
+async def read_items(request, schema):
+    """Yields ``(index, item, errors)`` for every item in the request body.
+
+    NDJSON bodies are parsed line by line as they arrive, so each item is
+    validated without buffering the whole upload. Any other content type is
+    read as a JSON array.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_CONTENT_TYPES:
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield (index, *_validate(schema, schema.parse_raw, line))
+                    index += 1
+        if buffer.strip():
+            yield (index, *_validate(schema, schema.parse_raw, buffer))
+        return
+
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be a JSON array or NDJSON with an application/x-ndjson content type",
+        )
+    for index, item in enumerate(items):
+        yield (index, *_validate(schema, schema.parse_obj, item))
+
+
+class BatchReport:
+    def __init__(self):
+        self.results = []
+        self.created = 0
+        self.failed = 0
+
+    def succeed(self, index, id_):
+        self.created += 1
+        self.results.append({"index": index, "status": "created", "id": id_})
+
+    def fail(self, index, errors):
+        self.failed += 1
+        self.results.append({"index": index, "status": "error", "errors": errors})
+
+    def dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "results": sorted(self.results, key=lambda result: result["index"]),
+        }
+
+
+def allocate_ids(session, table, count):
+    """Reserves ``count`` primary keys so rows can be inserted with one executemany.
+
+    Postgres draws them from the table's sequence. SQLite takes the ids after
+    the current maximum; a concurrent writer makes the insert fail with an
+    IntegrityError, and the caller retries. Other dialects return None.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return list(session.execute(
+            text(f"SELECT nextval('{table.name}_id_seq') FROM generate_series(1, :count)"),
+            {"count": count},
+        ).scalars())
+    if dialect == "sqlite":
+        start = session.execute(select(func.max(table.c.id))).scalar() or 0
+        return list(range(start + 1, start + count + 1))
+    return None
+
+
+def bulk_insert(session, table, rows):
+    """Inserts ``rows`` into ``table`` and returns their ids, in order."""
+    ids = allocate_ids(session, table, len(rows))
+    if ids is None:
+        return [
+            session.execute(table.insert(), row).inserted_primary_key[0] for row in rows
+        ]
+    session.execute(table.insert(), [{**row, "id": id_} for row, id_ in zip(rows, ids)])
+    return ids
@@ -0,0 +1,216 @@
+import base64
+import binascii
+import json
+import math
+import os
+import threading
+import time
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, asc, bindparam, desc, func, or_, text
+from sqlalchemy.dialects import postgresql
+from starlette import status
+
+COUNT_STRATEGIES = ("exact", "cached", "estimated", "none")
+
+
+def _dump_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(columns, row):
+    payload = {
+        "k": [column.key for column in columns],
+        "v": [_dump_value(getattr(row, column.key)) for column in columns],
+    }
+    return base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode()
+    ).decode().rstrip("=")
+
+
+def decode_cursor(columns, cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["k"] != [column.key for column in columns]:
+            raise ValueError("cursor was issued for a different sort order")
+        return [_load_value(column, value) for column, value in zip(columns, payload["v"])]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor {cursor}"
+        )
+
+
+def keyset_condition(columns, values, descending):
+    """Rows strictly after ``values`` in the ``columns`` sort order.
+
+    Expands ``(a, b, id) > (x, y, z)`` into ``a > x OR (a = x AND b > y) OR ...``
+    so the comparison works on every backend and can use the sort index.
+    """
+    conditions = []
+    for position, (column, value) in enumerate(zip(columns, values)):
+        after = column < value if descending else column > value
+        equal_prefix = [
+            previous == previous_value
+            for previous, previous_value in zip(columns[:position], values[:position])
+        ]
+        conditions.append(and_(*equal_prefix, after))
+    return or_(*conditions)
+
+
+def paginate(query, columns, descending, per_page, page=1, after=None):
+    """Returns one page of ``query`` sorted by ``columns`` and the cursor to the next one.
+
+    ``columns`` must end with a unique column, usually the primary key. With
+    ``after`` the page starts right after the row the cursor was issued for,
+    otherwise ``page`` is used as an offset.
+    """
+    sorting_order = desc if descending else asc
+    query = query.order_by(*(sorting_order(column) for column in columns))
+    if after is not None:
+        query = query.filter(keyset_condition(columns, decode_cursor(columns, after), descending))
+    elif page > 1:
+        query = query.offset((page - 1) * per_page)
+    rows = query.limit(per_page + 1).all()
+    if len(rows) > per_page:
+        return rows[:per_page], encode_cursor(columns, rows[per_page - 1])
+    return rows, None
+
+
+def paginate_rows(rows, columns, descending, per_page, page=1, after=None):
+    """`paginate` over ``rows``, a list already sorted ascending by ``columns``.
+
+    Pages and cursors are the same as `paginate` would give over the table
+    the rows came from. A cursor is found by its unique last column, or by
+    comparing sort keys if that row has gone since it was issued.
+    """
+    if descending:
+        rows = rows[::-1]
+    start = (page - 1) * per_page
+    if after is not None:
+        values = decode_cursor(columns, after)
+        key = columns[-1].key
+        start = next(
+            (position + 1 for position, row in enumerate(rows) if getattr(row, key) == values[-1]), None
+        )
+        if start is None:
+            cursor = tuple(values)
+
+            def is_after(row):
+                row_key = tuple(getattr(row, column.key) for column in columns)
+                return row_key < cursor if descending else row_key > cursor
+
+            start = next((position for position, row in enumerate(rows) if is_after(row)), len(rows))
+    rows = rows[start:start + per_page + 1]
+    if len(rows) > per_page:
+        return rows[:per_page], encode_cursor(columns, rows[per_page - 1])
+    return rows, None
+
+
+class CountCache:
+    """Row counts per count query, dropped when their table is written to.
+
+    ``ttl`` bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, table, key):
+        entry = self._entries.get((table, key))
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, table, key, count):
+        with self._lock:
+            self._entries[(table, key)] = (time.monotonic() + self.ttl, count)
+
+    def invalidate(self, *tables):
+        with self._lock:
+            for entry in [entry for entry in self._entries if entry[0] in tables]:
+                del self._entries[entry]
+
+
+count_cache = CountCache(ttl=float(os.getenv("COUNT_CACHE_TTL", "60")))
+
+
+def get_count_strategy(endpoint):
+    strategy = os.getenv(f"COUNT_STRATEGY_{endpoint.upper()}", os.getenv("COUNT_STRATEGY", "exact"))
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(
+            f"Unknown count strategy {strategy} for {endpoint}, expected one of {', '.join(COUNT_STRATEGIES)}"
+        )
+    return strategy
+
+
+def _estimate_rows(query):
+    session = query.session
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    # literal_binds can't render dates for Postgres, so the statement keeps
+    # named placeholders and EXPLAIN binds its parameters with their types
+    compiled = query.enable_eagerloads(False).order_by(None).statement.compile(
+        dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"render_postcompile": True}
+    )
+    explain = text(f"EXPLAIN (FORMAT JSON) {compiled}").bindparams(
+        *(bindparam(name, value, type_=compiled.binds[name].type) for name, value in compiled.params.items())
+    )
+    plan = session.execute(explain).scalar()
+    # psycopg2 decodes json columns, asyncpg hands them over as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(query, column, strategy="exact"):
+    """Counts the rows ``query`` matches with the given strategy.
+
+    ``exact`` runs ``SELECT count(column)`` without ORDER BY or eager loads.
+    ``cached`` reuses an exact count until ``column``'s table is invalidated.
+    ``estimated`` uses the planner's row estimate on Postgres and falls back
+    to ``cached`` elsewhere. ``none`` skips counting and returns None.
+    """
+    if strategy == "none":
+        return None
+    if strategy == "estimated":
+        estimate = _estimate_rows(query)
+        if estimate is not None:
+            return estimate
+    count_query = query.enable_eagerloads(False).order_by(None).with_entities(func.count(column))
+    if strategy == "exact":
+        return count_query.scalar()
+    compiled = count_query.statement.compile()
+    key = (str(compiled), tuple(sorted((name, str(value)) for name, value in compiled.params.items())))
+    count = count_cache.get(column.table.name, key)
+    if count is None:
+        count = count_query.scalar()
+        count_cache.set(column.table.name, key, count)
+    return count
+
+
+def count_pages(query, column, per_page, strategy="exact"):
+    count = count_rows(query, column, strategy)
+    if count is None:
+        return None
+    return max(1, math.ceil(count / per_page))
+
+
+def count_row_pages(rows, per_page, strategy="exact"):
+    """`count_pages` for rows already in memory, where every strategy but ``none`` is exact."""
+    if strategy == "none":
+        return None
+    return max(1, math.ceil(len(rows) / per_page))
@@ -2,7 +2,7 @@ from datetime import datetime, date
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, confloat, conlist, conint, Extra, create_model
+from pydantic import BaseModel, confloat, conlist, conint, Extra, create_model, validator
 
 
 class AmountPerTimeEnum(Enum):
@@ -54,7 +54,8 @@ class GetJobSchema(BaseModel):
 
 class ListJobsSchema(BaseModel):
     jobs: list[GetJobSchema]
-    pages: conint(ge=1)
+    pages: Optional[conint(ge=1)]
+    nextCursor: Optional[str]
 
 
 class CreateJobSchema(BaseModel):
@@ -68,6 +69,19 @@ class CreateJobSchema(BaseModel):
     skills: conlist(str, min_items=1)
     liveUntil: datetime
 
+    @validator("liveUntil")
+    def live_until_in_the_future(cls, value):
+        # Expired jobs would be listed until the expiry sweeper next hides them
+        now = datetime.now(value.tzinfo) if value.tzinfo is not None else datetime.utcnow()
+        if value <= now:
+            raise ValueError("liveUntil must be in the future")
+        return value
+
+
+class ExportFormatEnum(Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
 
 class SortByEnum(Enum):
     datePosted = "datePosted"
@@ -86,7 +100,8 @@ class GetSkill(BaseModel):
 
 class ListSkills(BaseModel):
     skills: list[GetSkill]
-    pages: int
+    pages: Optional[int]
+    nextCursor: Optional[str]
 
 
 class GetLocation(BaseModel):
@@ -106,7 +121,8 @@ class GetLocation(BaseModel):
 
 class ListLocations(BaseModel):
     locations: list[GetLocation]
-    pages: int
+    pages: Optional[int]
+    nextCursor: Optional[str]
 
 
 class CreateJobApplication(BaseModel):
@@ -126,4 +142,66 @@ class GetJobApplication(BaseModel):
 
 class ListJobApplications(BaseModel):
     applications: list[GetJobApplication]
-    pages: int
+    pages: Optional[int]
+    nextCursor: Optional[str]
+
+
+class GetJobMatch(BaseModel):
+    job: GetJobSchema
+    score: int
+    matchedSkills: list[str]
+
+
+class ListJobMatches(BaseModel):
+    matches: list[GetJobMatch]
+
+
+class ContractTypeFacet(BaseModel):
+    value: ContractTypeEnum
+    count: int
+
+
+class LocationFacet(GetLocation):
+    count: int
+
+
+class SkillFacet(GetSkill):
+    count: int
+
+
+class JobFacets(BaseModel):
+    contractTypes: list[ContractTypeFacet]
+    locations: list[LocationFacet]
+    skills: list[SkillFacet]
+
+
+class Applicant(BaseModel):
+    # No email until only the job's recruiter can list its applicants
+    id: int
+    name: str
+
+
+class GetJobApplicant(BaseModel):
+    id: int
+    candidate: Optional[Applicant]
+    applied: date
+    cancelled: bool
+
+
+class DailyApplications(BaseModel):
+    day: date
+    total: int
+    cancelled: int
+
+
+class JobApplicationStats(BaseModel):
+    total: int
+    cancelled: int
+    perDay: list[DailyApplications]
+
+
+class ListJobApplicants(BaseModel):
+    applications: list[GetJobApplicant]
+    pages: Optional[int]
+    nextCursor: Optional[str]
+    stats: Optional[JobApplicationStats]
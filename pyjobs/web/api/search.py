@@ -0,0 +1,57 @@
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import Float, column, func, literal_column, table
+from starlette import status
+
+from pyjobs.models.models import Job
+
+# FTS5 table created by migration 8d3a6b2c4e17, rowid is the job id
+job_search = table("job_search", column("rowid"), column("job_search"))
+
+# bm25 weights for the title and description columns
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def fts5_query(q):
+    """Turns free text into an FTS5 query matching every word.
+
+    Each term is quoted, so operators and punctuation in user input are
+    treated as text instead of FTS5 syntax.
+    """
+    return " ".join(f'"{term}"' for term in TERM_PATTERN.findall(q))
+
+
+def search_jobs(session, query, q):
+    """Restricts ``query`` to jobs matching ``q`` and returns it with a rank expression.
+
+    The rank is lower for better matches on every backend, so results sort
+    ascending by ``(rank, Job.id)`` and the pair works as a keyset cursor.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = fts5_query(q)
+        if not match:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"No searchable terms in {q!r}"
+            )
+        rank = func.bm25(
+            literal_column("job_search"), TITLE_WEIGHT, DESCRIPTION_WEIGHT, type_=Float
+        ).label("rank")
+        query = query.join(job_search, job_search.c.rowid == Job.id).filter(
+            job_search.c.job_search.op("MATCH")(match)
+        )
+        return query, rank
+    if dialect == "postgresql":
+        search_vector = literal_column("job.search_vector")
+        ts_query = func.websearch_to_tsquery("english", q)
+        # Titles are weighted A and descriptions B by the generated column
+        rank = (-func.ts_rank_cd(search_vector, ts_query)).cast(Float).label("rank")
+        return query.filter(search_vector.op("@@")(ts_query)), rank
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail=f"Full-text search is not available on {dialect}",
+    )
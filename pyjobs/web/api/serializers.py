@@ -0,0 +1,63 @@
+"""Builds API payloads straight from ORM rows.
+
+These produce the same JSON documents as validating `Job.dict()` through
+`GetJobSchema`, without touching the job's relationships. Handlers use
+them on every path and hand them to `ORJSONResponse` directly when
+``FAST_RESPONSES`` is on.
+"""
+from pyjobs.models.reference import reference_data
+
+
+def serialize_location(location):
+    if location.state is None:
+        return {"city": location.city, "country": location.country}
+    return {"city": location.city, "state": location.state, "country": location.country}
+
+
+def serialize_job(job, skills):
+    """Document for a `Job` or a `job_listing_columns` row with ``skills`` names.
+
+    Locations, hirers and recruiters come from `reference_data`, so neither
+    needs to be joined or lazy loaded.
+    """
+    recruiter = reference_data.recruiter(job.recruiter_id)
+    return {
+        "id": job.id,
+        "title": job.title,
+        "dateListed": job.date_posted,
+        "rate": {
+            "amount": float(job.rate),
+            "amountPerTime": job.rate_per_time_unit,
+        },
+        "benefits": job.benefits or "",
+        "location": serialize_location(reference_data.location(job.location_id)),
+        "hirer": reference_data.hirer(job.hirer_id).name,
+        "recruiter": {
+            "name": recruiter.name,
+            "email": recruiter.email,
+        },
+        "contractType": job.contract_type,
+        "skills": skills,
+        "liveUntil": job.live_until,
+    }
+
+
+def serialize_application(application, skills):
+    return {
+        "id": application.id,
+        "job": serialize_job(application.job_listing, skills),
+        "applied": application.created.date(),
+        "cancelled": application.cancelled,
+    }
+
+
+def serialize_applicant_row(row):
+    return {
+        "id": row.id,
+        "candidate": {
+            "id": row.candidate_id,
+            "name": row.name,
+        } if row.candidate_id is not None else None,
+        "applied": row.created.date(),
+        "cancelled": row.cancelled,
+    }
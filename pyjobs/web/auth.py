@@ -1,23 +1,59 @@
-import requests
-from jose import jwt, jws
+import os
 
-public_keys = requests.get(
-    "https://coffeemesh-dev.eu.auth0.com/.well-known/jwks.json"
-).json()["keys"]
+from jose.exceptions import JWTError
 
+from pyjobs.web.jwks import JWKSKeyStore
+from pyjobs.web.jwt_backends import get_backend
+from pyjobs.web.token_cache import TokenCache
+from pyjobs.web.verification import VerificationExecutor
 
-def _get_certificate_for_key(kid):
-    for key in public_keys:
-        if key["kid"] == kid:
-            return key
-    raise Exception(f"No matching key found for kid {kid}")
+key_store = JWKSKeyStore(
+    source=os.getenv("JWKS_URL", "https://coffeemesh-dev.eu.auth0.com/.well-known/jwks.json"),
+    refresh_interval=float(os.getenv("JWKS_REFRESH_INTERVAL", "3600")),
+    min_refresh_interval=float(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30")),
+)
 
+jwt_backend = get_backend(os.getenv("JWT_BACKEND", "jose"))
 
-def validate_token(token):
-    unverified_headers = jws.get_unverified_headers(token)
-    return jwt.decode(
-        token=token,
-        key=_get_certificate_for_key(unverified_headers["kid"]),
+token_cache = TokenCache(
+    max_size=int(os.getenv("TOKEN_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", "300")),
+)
+
+
+def _decode_token(token):
+    kid = jwt_backend.get_unverified_header(token).get("kid")
+    if kid is None:
+        raise JWTError("Token has no kid header")
+    return jwt_backend.decode(
+        token,
+        key=key_store.get_key(kid),
         audience="http://127.0.0.1:8000/jobs",
         algorithms=["RS256"],
     )
+
+
+def validate_token(token):
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    claims = _decode_token(token)
+    token_cache.set(token, claims)
+    return claims
+
+
+verification_executor = VerificationExecutor(
+    _decode_token,
+    mode=os.getenv("TOKEN_VERIFY_MODE", "thread"),
+    max_workers=int(os.getenv("TOKEN_VERIFY_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("TOKEN_VERIFY_MAX_PENDING", "256")),
+)
+
+
+async def validate_token_async(token):
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    claims = await verification_executor.submit(token)
+    token_cache.set(token, claims)
+    return claims
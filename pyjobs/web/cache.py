@@ -0,0 +1,225 @@
+import functools
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+
+from pyjobs.models.replica import replica_monitor
+from pyjobs.web.middleware import last_write
+
+
+class LRUCacheBackend:
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_version(self, namespace):
+        return self._versions.get(namespace, 0)
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+
+class RedisCacheBackend:
+    """Stores entries in Redis so every worker shares them.
+
+    ``client`` is anything with the redis-py ``get``/``set``/``incr``
+    interface, e.g. ``redis.Redis`` or ``fakeredis.FakeRedis`` in tests.
+    """
+
+    def __init__(self, client, prefix="pyjobs:response-cache"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(f"{self.prefix}:{key}")
+
+    def set(self, key, value, ttl):
+        self.client.set(f"{self.prefix}:{key}", value, ex=max(1, int(ttl)))
+
+    def get_version(self, namespace):
+        return int(self.client.get(f"{self.prefix}:version:{namespace}") or 0)
+
+    def bump_version(self, namespace):
+        self.client.incr(f"{self.prefix}:version:{namespace}")
+
+
+class ResponseCache:
+    """Cached GET response bodies, grouped in namespaces.
+
+    Invalidating a namespace bumps its version, which is part of every key,
+    so all its entries become unreachable at once and age out of the backend.
+    """
+
+    def __init__(self, backend, ttl=60):
+        self.backend = backend
+        self.ttl = ttl
+
+    def _key(self, namespace, path, query_string):
+        query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+        return f"{namespace}:{self.backend.get_version(namespace)}:{path}?{query}"
+
+    def get(self, namespace, path, query_string):
+        key = self._key(namespace, path, query_string)
+        value = self.backend.get(key)
+        if value is None:
+            return key, None
+        content_type, etag, body = value.split(b"\n", 2)
+        return key, (content_type, etag, body)
+
+    def set(self, key, content_type, body):
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'.encode()
+        self.backend.set(key, b"\n".join((content_type, etag, body)), self.ttl)
+        return etag
+
+    def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            self.backend.bump_version(namespace)
+
+
+def create_response_cache():
+    """Builds the cache RESPONSE_CACHE names: memory, redis or off.
+
+    The redis backend shares entries between workers through REDIS_URL. It
+    needs the redis package, which isn't in the Pipfile since only that
+    backend uses it: ``pipenv install redis`` where it's enabled.
+    """
+    backend = os.getenv("RESPONSE_CACHE", "memory")
+    ttl = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    if backend == "memory":
+        return ResponseCache(
+            LRUCacheBackend(max_size=int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))), ttl=ttl
+        )
+    if backend == "redis":
+        import redis
+
+        return ResponseCache(
+            RedisCacheBackend(redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))),
+            ttl=ttl,
+        )
+    if backend == "off":
+        return None
+    raise ValueError(f"Unknown response cache backend {backend}, expected memory, redis or off")
+
+
+response_cache = create_response_cache()
+
+
+def invalidate_responses(*namespaces):
+    if response_cache is not None:
+        response_cache.invalidate(*namespaces)
+        # Responses read from a lagging replica in the meantime may predate the
+        # write, so invalidate again once the replica has it
+        replica_monitor.after_caught_up(
+            datetime.utcnow(), functools.partial(response_cache.invalidate, *namespaces)
+        )
+
+
+class ResponseCacheMiddleware:
+    """Serves cached GET responses and answers If-None-Match with 304.
+
+    ``routes`` maps path regexes to a namespace template, formatted with the
+    regex's named groups, e.g. ``{r"^/jobs/(?P<job_id>\\d+)$": "job:{job_id}"}``.
+
+    Clients whose last write, going by `ReadReplicaMiddleware`'s cookie, the
+    replica hasn't caught up with yet bypass the cache: entries stored from
+    the replica in the meantime may predate their write.
+    """
+
+    def __init__(self, app, routes, cache=None, monitor=None, cookie_name="last_write"):
+        self.app = app
+        self.routes = [(re.compile(pattern), namespace) for pattern, namespace in routes.items()]
+        self.cache = cache if cache is not None else response_cache
+        self.monitor = monitor if monitor is not None else replica_monitor
+        self.cookie_name = cookie_name
+
+    def _namespace(self, path):
+        for pattern, namespace in self.routes:
+            match = pattern.match(path)
+            if match:
+                return namespace.format(**match.groupdict())
+        return None
+
+    @staticmethod
+    async def _send_response(send, status, content_type, body, etag, if_none_match):
+        headers = [(b"etag", etag)]
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag.decode("latin-1") in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if self.cache is None or scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        namespace = self._namespace(scope["path"])
+        if namespace is None:
+            return await self.app(scope, receive, send)
+        if self.monitor.enabled:
+            written_at = last_write(scope, self.cookie_name)
+            if written_at is not None and not self.monitor.caught_up(written_at):
+                return await self.app(scope, receive, send)
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        key, cached = self.cache.get(namespace, scope["path"], scope["query_string"].decode("latin-1"))
+        if cached is not None:
+            content_type, etag, body = cached
+            return await self._send_response(send, 200, content_type, body, etag, if_none_match)
+
+        start = None
+        chunks = []
+
+        async def capture(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        body = b"".join(chunks)
+        headers = Headers(raw=start["headers"])
+        content_type = headers.get("content-type", "application/json").encode("latin-1")
+        if start["status"] != 200:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+        etag = self.cache.set(key, content_type, body)
+        await self._send_response(send, 200, content_type, body, etag, if_none_match)
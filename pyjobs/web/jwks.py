@@ -0,0 +1,98 @@
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from jose.exceptions import JWTError
+
+from pyjobs.web.keys import load_jwk_public_key
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeyStore:
+    """Parsed public keys from a JWKS document, indexed by ``kid``.
+
+    ``source`` is an http(s) URL, a ``file://`` URL or a path on disk. Keys are
+    refreshed by a background thread every ``refresh_interval`` seconds and on
+    demand when an unknown ``kid`` shows up, but never more often than once
+    every ``min_refresh_interval`` seconds.
+    """
+
+    def __init__(self, source, refresh_interval=3600, min_refresh_interval=30, timeout=5):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys = {}
+        self._last_refresh = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _fetch(self):
+        url = urlparse(self.source)
+        if url.scheme in ("http", "https"):
+            response = requests.get(self.source, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        path = url.path if url.scheme == "file" else self.source
+        return json.loads(Path(path).read_text())
+
+    @staticmethod
+    def _parse(jwks):
+        keys = {}
+        for key in jwks["keys"]:
+            if key.get("use", "sig") != "sig" or "kid" not in key:
+                continue
+            keys[key["kid"]] = load_jwk_public_key(key)
+        return keys
+
+    def refresh(self, force=False):
+        with self._refresh_lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._last_refresh is not None
+                and now - self._last_refresh < self.min_refresh_interval
+            ):
+                return False
+            self._last_refresh = now
+            try:
+                keys = self._parse(self._fetch())
+            except Exception:
+                logger.exception("Failed to refresh JWKS from %s", self.source)
+                return False
+            # Swap the whole dict so readers never see a partially built key set
+            self._keys = keys
+            return True
+
+    def get_key(self, kid):
+        key = self._keys.get(kid)
+        if key is None:
+            self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"No matching key found for kid {kid}")
+        return key
+
+    def _run(self):
+        self.refresh(force=True)
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh(force=True)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="jwks-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
@@ -0,0 +1,165 @@
+import base64
+import json
+from abc import ABC, abstractmethod
+
+import jwt as pyjwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk as jose_jwk, jwt as jose_jwt, jws as jose_jws
+from jose.exceptions import ExpiredSignatureError, JWSError, JWTError
+from jwcrypto import jwk as jwcrypto_jwk, jwt as jwcrypto_jwt
+from jwcrypto.common import JWException
+from jwcrypto.jwt import JWTExpired
+
+
+class JWTBackend(ABC):
+    """Signs and verifies JWTs with one of the supported libraries.
+
+    Every backend accepts `cryptography` key objects (see `pyjobs.web.keys`)
+    or a shared secret for HMAC algorithms, and raises jose's
+    `ExpiredSignatureError`/`JWTError` on invalid tokens so callers only
+    need to handle one family of exceptions.
+    """
+
+    name = None
+
+    def __init__(self):
+        self._prepared_keys = {}
+
+    def _prepare_key(self, key, algorithm):
+        return key
+
+    def _get_key(self, key, algorithm):
+        # Libraries that wrap keys in their own types pay for it once per key
+        cached = self._prepared_keys.get((id(key), algorithm))
+        if cached is not None and cached[0] is key:
+            return cached[1]
+        prepared = self._prepare_key(key, algorithm)
+        if len(self._prepared_keys) >= 64:
+            # Rotated keys are never looked up again
+            self._prepared_keys.clear()
+        self._prepared_keys[(id(key), algorithm)] = (key, prepared)
+        return prepared
+
+    @abstractmethod
+    def get_unverified_header(self, token):
+        ...
+
+    @abstractmethod
+    def encode(self, claims, key, algorithm, headers=None):
+        ...
+
+    @abstractmethod
+    def decode(self, token, key, algorithms, audience=None):
+        ...
+
+
+class JoseBackend(JWTBackend):
+    name = "jose"
+
+    def _prepare_key(self, key, algorithm):
+        if isinstance(key, rsa.RSAPrivateKey):
+            # jose only accepts RSA private keys as PEM
+            key = key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+        return jose_jwk.construct(key, algorithm)
+
+    def get_unverified_header(self, token):
+        try:
+            return jose_jws.get_unverified_header(token)
+        except JWSError as error:
+            # Malformed tokens raise JWSError, which isn't a JWTError
+            raise JWTError(str(error))
+
+    def encode(self, claims, key, algorithm, headers=None):
+        return jose_jwt.encode(
+            claims=claims, key=self._get_key(key, algorithm), algorithm=algorithm, headers=headers
+        )
+
+    def decode(self, token, key, algorithms, audience=None):
+        algorithm = self.get_unverified_header(token).get("alg")
+        if algorithm not in algorithms:
+            raise JWTError("The specified alg value is not allowed")
+        try:
+            return jose_jwt.decode(
+                token=token, key=self._get_key(key, algorithm), algorithms=algorithms, audience=audience
+            )
+        except JWSError as error:
+            raise JWTError(str(error))
+
+
+class PyJWTBackend(JWTBackend):
+    name = "pyjwt"
+
+    def get_unverified_header(self, token):
+        try:
+            return pyjwt.get_unverified_header(token)
+        except pyjwt.InvalidTokenError as error:
+            raise JWTError(str(error))
+
+    def encode(self, claims, key, algorithm, headers=None):
+        return pyjwt.encode(payload=claims, key=key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token, key, algorithms, audience=None):
+        try:
+            return pyjwt.decode(token, key=key, algorithms=algorithms, audience=audience)
+        except pyjwt.ExpiredSignatureError as error:
+            raise ExpiredSignatureError(str(error))
+        except pyjwt.InvalidTokenError as error:
+            raise JWTError(str(error))
+
+
+class JWCryptoBackend(JWTBackend):
+    name = "jwcrypto"
+
+    def _prepare_key(self, key, algorithm):
+        if isinstance(key, (str, bytes)):
+            return jwcrypto_jwk.JWK.from_password(key.decode() if isinstance(key, bytes) else key)
+        return jwcrypto_jwk.JWK.from_pyca(key)
+
+    def get_unverified_header(self, token):
+        header = token.split(".")[0]
+        try:
+            return json.loads(base64.urlsafe_b64decode(header + "=" * (-len(header) % 4)))
+        except ValueError as error:
+            raise JWTError(str(error))
+
+    def encode(self, claims, key, algorithm, headers=None):
+        token = jwcrypto_jwt.JWT(header={**(headers or {}), "alg": algorithm}, claims=claims)
+        token.make_signed_token(self._get_key(key, algorithm))
+        return token.serialize()
+
+    def decode(self, token, key, algorithms, audience=None):
+        # Any check_claims replaces jwcrypto's default exp/nbf checks, so exp is
+        # always listed; unlike the other backends this makes it required
+        check_claims = {"exp": None}
+        if audience is not None:
+            check_claims["aud"] = audience
+        verified = jwcrypto_jwt.JWT(algs=list(algorithms), check_claims=check_claims)
+        # jose and PyJWT allow no clock skew, jwcrypto a minute by default
+        verified.leeway = 0
+        try:
+            verified.deserialize(token, self._get_key(key, None))
+        except JWTExpired as error:
+            raise ExpiredSignatureError(str(error))
+        except (JWException, ValueError) as error:
+            raise JWTError(str(error))
+        return json.loads(verified.claims)
+
+
+backends = {
+    backend.name: backend
+    for backend in (JoseBackend, PyJWTBackend, JWCryptoBackend)
+}
+
+
+def get_backend(name):
+    try:
+        return backends[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown JWT backend {name}, expected one of {', '.join(backends)}"
+        )
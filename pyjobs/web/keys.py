@@ -0,0 +1,57 @@
+import base64
+import json
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, ed448, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from cryptography.x509 import load_pem_x509_certificate
+
+_CURVES = {
+    "P-256": ec.SECP256R1,
+    "P-384": ec.SECP384R1,
+    "P-521": ec.SECP521R1,
+}
+
+
+def _b64_to_int(value):
+    return int.from_bytes(_b64_decode(value), "big")
+
+
+def _b64_decode(value):
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def load_jwk_public_key(key):
+    if isinstance(key, (str, bytes)):
+        key = json.loads(key)
+    kty = key["kty"]
+    if kty == "RSA":
+        return rsa.RSAPublicNumbers(
+            e=_b64_to_int(key["e"]), n=_b64_to_int(key["n"])
+        ).public_key()
+    if kty == "EC":
+        return ec.EllipticCurvePublicNumbers(
+            x=_b64_to_int(key["x"]), y=_b64_to_int(key["y"]), curve=_CURVES[key["crv"]]()
+        ).public_key()
+    if kty == "OKP" and key["crv"] == "Ed25519":
+        return ed25519.Ed25519PublicKey.from_public_bytes(_b64_decode(key["x"]))
+    if kty == "OKP" and key["crv"] == "Ed448":
+        return ed448.Ed448PublicKey.from_public_bytes(_b64_decode(key["x"]))
+    raise ValueError(f"Unsupported JWK key type {kty}")
+
+
+def load_public_key(data):
+    """Builds a `cryptography` public key object from PEM, x509 or JWK input.
+
+    Parse keys once at load time and hand the returned object to the JWT
+    library, so verification does not re-parse the key material per token.
+    """
+    if isinstance(data, dict):
+        return load_jwk_public_key(data)
+    if isinstance(data, str):
+        data = data.encode()
+    data = data.strip()
+    if data.startswith(b"{"):
+        return load_jwk_public_key(data)
+    if data.startswith(b"-----BEGIN CERTIFICATE-----"):
+        return load_pem_x509_certificate(data).public_key()
+    return load_pem_public_key(data)
@@ -0,0 +1,152 @@
+import math
+import os
+import time
+from datetime import datetime
+
+from jose import ExpiredSignatureError, JWTError
+from jose.exceptions import JWTClaimsError
+from starlette import status
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+
+from pyjobs.models.database import use_replica
+from pyjobs.models.replica import replica_monitor
+from pyjobs.web.auth import validate_token_async
+from pyjobs.web.verification import VerificationQueueFull
+
+
+def last_write(scope, cookie_name="last_write"):
+    """When the client last wrote, from the cookie `ReadReplicaMiddleware` sets on writes."""
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            written_at = cookie_parser(value.decode("latin-1")).get(cookie_name)
+            try:
+                return datetime.utcfromtimestamp(float(written_at)) if written_at else None
+            except ValueError:
+                return None
+    return None
+
+
+class AuthorizeRequestMiddleware:
+    """Raw ASGI middleware that validates bearer tokens.
+
+    Configuration is read once when the middleware is built. The user id
+    taken from the token's ``sub`` claim is stored in ``scope["state"]``,
+    where `Request.state` picks it up.
+    """
+
+    def __init__(
+        self,
+        app,
+        auth_on=None,
+        exempt_paths=("/docs", "/openapi.json", "/redocs"),
+        exempt_methods=("OPTIONS",),
+        validate=validate_token_async,
+    ):
+        self.app = app
+        if auth_on is None:
+            auth_on = os.getenv("AUTH_ON", "False") == "True"
+        self.auth_on = auth_on
+        self.exempt_paths = frozenset(exempt_paths)
+        self.exempt_methods = frozenset(exempt_methods)
+        self.validate = validate
+
+    @staticmethod
+    def _unauthorized(detail):
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"detail": detail, "body": detail},
+        )
+
+    @staticmethod
+    def _unavailable(detail):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": detail, "body": detail},
+            headers={"Retry-After": "1"},
+        )
+
+    @staticmethod
+    def _get_authorization(scope):
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                return value.decode("latin-1")
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if not self.auth_on:
+            scope.setdefault("state", {})["user_id"] = "test"
+            return await self.app(scope, receive, send)
+
+        if scope["path"] in self.exempt_paths or scope["method"] in self.exempt_methods:
+            return await self.app(scope, receive, send)
+
+        bearer_token = self._get_authorization(scope)
+        if not bearer_token:
+            response = self._unauthorized("Missing access token")
+            return await response(scope, receive, send)
+        try:
+            auth_token = bearer_token.split(" ")[1].strip()
+            token_payload = await self.validate(auth_token)
+        except IndexError:
+            response = self._unauthorized("Malformed authorization header")
+            return await response(scope, receive, send)
+        except VerificationQueueFull as error:
+            response = self._unavailable(str(error))
+            return await response(scope, receive, send)
+        except (
+            ExpiredSignatureError,
+            JWTError,
+            JWTClaimsError,
+        ) as error:
+            response = self._unauthorized(str(error))
+            return await response(scope, receive, send)
+
+        scope.setdefault("state", {})["user_id"] = int(token_payload["sub"])
+        return await self.app(scope, receive, send)
+
+
+class ReadReplicaMiddleware:
+    """Raw ASGI middleware that sends reads to the replica when it is fresh enough.
+
+    GET and HEAD requests set `use_replica` while `ReplicaMonitor` reports
+    the replica healthy and caught up with the client's last write. Every
+    other request is a write: its response sets a cookie with the time it
+    finished, so the client's following reads, e.g. fetching an application
+    right after applying, go to the primary until the replica has the write.
+    """
+
+    def __init__(self, app, monitor=None, cookie_name="last_write", read_methods=("GET", "HEAD")):
+        self.app = app
+        self.monitor = monitor if monitor is not None else replica_monitor
+        self.cookie_name = cookie_name
+        self.read_methods = frozenset(read_methods)
+        # After this long the replica has either caught up with a write or turned unhealthy
+        self.cookie_max_age = math.ceil(self.monitor.interval + self.monitor.max_lag.total_seconds())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.monitor.enabled:
+            return await self.app(scope, receive, send)
+
+        if scope["method"] in self.read_methods:
+            if not self.monitor.caught_up(last_write(scope, self.cookie_name)):
+                return await self.app(scope, receive, send)
+            token = use_replica.set(True)
+            try:
+                return await self.app(scope, receive, send)
+            finally:
+                use_replica.reset(token)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                cookie = (
+                    f"{self.cookie_name}={time.time():.3f}; Max-Age={self.cookie_max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        return await self.app(scope, receive, send_with_cookie)
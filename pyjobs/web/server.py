@@ -1,59 +1,93 @@
 import os
 
 from fastapi import FastAPI
-from jose import ExpiredSignatureError, JWTError
-from jose.exceptions import JWTClaimsError
-from starlette import status
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
 
+from pyjobs.matching import job_match_index
+from pyjobs.models.database import dispose_engines
+from pyjobs.models.reference import reference_data
+from pyjobs.models.replica import replica_monitor
 from pyjobs.web.api.api import router as jobs_router
-from pyjobs.web.auth import validate_token
+from pyjobs.web.api.expiry import expiry_sweeper
+from pyjobs.web.auth import key_store, verification_executor
+from pyjobs.web.cache import ResponseCacheMiddleware
+from pyjobs.web.middleware import AuthorizeRequestMiddleware, ReadReplicaMiddleware
 
 server = FastAPI(debug=True)
 
 server.include_router(jobs_router)
 
 
-class AuthorizeRequestMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        if os.getenv("AUTH_ON", "False") != "True":
-            request.state.user_id = "test"
-            return await call_next(request)
-
-        if request.url.path in ["/docs", "/openapi.json", "/redocs"]:
-            return await call_next(request)
-        if request.method == "OPTIONS":
-            return await call_next(request)
-
-        bearer_token = request.headers.get("Authorization")
-        if not bearer_token:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={
-                    "detail": "Missing access token",
-                    "body": "Missing access token",
-                }
-            )
-        try:
-            auth_token = bearer_token.split(" ")[1].strip()
-            token_payload = validate_token(auth_token)
-        except (
-            ExpiredSignatureError,
-            JWTError,
-            JWTClaimsError,
-        ) as error:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": str(error), "body": str(error)}
-            )
-        else:
-            request.state.user_id = int(token_payload["sub"])
-        return await call_next(request)
+@server.on_event("startup")
+def start_key_store():
+    # Only tokens need the JWKS, so don't fetch it with auth off
+    if os.getenv("AUTH_ON", "False") == "True":
+        key_store.start()
 
 
-server.add_middleware(AuthorizeRequestMiddleware)
+@server.on_event("shutdown")
+def stop_key_store():
+    key_store.stop()
+
+
+@server.on_event("startup")
+def start_reference_data():
+    reference_data.start()
+
+
+@server.on_event("shutdown")
+def stop_reference_data():
+    reference_data.stop()
+
+
+@server.on_event("startup")
+def start_job_match_index():
+    job_match_index.start()
+
+
+@server.on_event("shutdown")
+def stop_job_match_index():
+    job_match_index.stop()
+
+
+@server.on_event("startup")
+def start_expiry_sweeper():
+    expiry_sweeper.start()
+
 
+@server.on_event("shutdown")
+def stop_expiry_sweeper():
+    expiry_sweeper.stop()
+
+
+@server.on_event("startup")
+def start_replica_monitor():
+    replica_monitor.start()
+
+
+@server.on_event("shutdown")
+def stop_replica_monitor():
+    replica_monitor.stop()
+
+
+@server.on_event("shutdown")
+def stop_verification_executor():
+    verification_executor.shutdown()
+
+
+@server.on_event("shutdown")
+async def close_database_connections():
+    await dispose_engines()
+
+
+server.add_middleware(ReadReplicaMiddleware)
+server.add_middleware(
+    ResponseCacheMiddleware,
+    routes={
+        r"^/skills$": "skills",
+        r"^/locations$": "locations",
+        r"^/jobs$": "jobs",
+        r"^/jobs/facets$": "jobs",
+        r"^/jobs/(?P<job_id>\d+)$": "job:{job_id}",
+    },
+)
+server.add_middleware(AuthorizeRequestMiddleware)
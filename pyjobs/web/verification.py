@@ -0,0 +1,66 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class VerificationQueueFull(Exception):
+    pass
+
+
+class VerificationExecutor:
+    """Runs token verification off the event loop.
+
+    ``mode`` is ``inline`` (run on the event loop), ``thread`` or ``process``.
+    Process workers are spawned, so ``verify`` must be importable by name.
+    At most ``max_pending`` distinct tokens are verified at once; beyond that
+    `submit` raises `VerificationQueueFull`. Concurrent submissions of the
+    same token share a single verification.
+    """
+
+    modes = ("inline", "thread", "process")
+
+    def __init__(self, verify, mode="thread", max_workers=None, max_pending=256):
+        if mode not in self.modes:
+            raise ValueError(f"Unknown verification mode {mode}, expected one of {', '.join(self.modes)}")
+        self.verify = verify
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._in_flight = {}
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="token-verify"
+                )
+            else:
+                # Forking now would copy locks held by the JWKS, reference data and
+                # other background threads, so workers start from fresh interpreters
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def submit(self, token):
+        if self.mode == "inline":
+            return self.verify(token)
+
+        future = self._in_flight.get(token)
+        if future is None:
+            if len(self._in_flight) >= self.max_pending:
+                raise VerificationQueueFull(
+                    f"{len(self._in_flight)} token verifications already pending"
+                )
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), self.verify, token)
+            self._in_flight[token] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(token, None))
+        # Shield the shared future so one cancelled request doesn't cancel the others
+        return await asyncio.shield(future)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
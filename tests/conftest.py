@@ -0,0 +1,88 @@
+import os
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# The app reads its configuration at import time, so it's set before any pyjobs import
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'pyjobs.db')}",
+    AUTH_ON="False",
+    RESPONSE_CACHE="off",
+    EXPIRY_SWEEP_INTERVAL="0",
+)
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import Candidate, Hirer, Location, Recruiter, Skill
+
+SKILLS = ("Python", "Django", "FastAPI", "PostgreSQL", "Docker", "AWS")
+
+JOBS = 30
+
+
+def job_body(**overrides):
+    return {
+        "title": "Python developer",
+        "description": "Build APIs",
+        "contractType": "permanent",
+        "rate": {"amount": 500, "amountPerTime": "day"},
+        "benefits": "Remote",
+        "location": 1,
+        "hirer": 1,
+        "skills": ["1", "2"],
+        "liveUntil": "2031-01-01T00:00:00",
+        **overrides,
+    }
+
+
+def migrate():
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    command.upgrade(config, "head")
+
+
+def load_reference_data():
+    with session_maker() as session:
+        hirer = Hirer(name="PyJobs.works")
+        session.add_all([
+            Recruiter(name="Joe Wow", email="joe@pyjobs.works", hirer=hirer),
+            Location(city="London", country="UK"),
+            Location(city="Austin", state="TX", country="US"),
+            *(Skill(name=name) for name in SKILLS),
+        ])
+        session.flush()
+        session.add(Candidate(name="Wow Whew", email="wow.whew@example.com", location_id=1))
+        session.commit()
+
+
+@pytest.fixture(scope="session")
+def client():
+    migrate()
+    load_reference_data()
+    from pyjobs.web.server import server
+
+    with TestClient(server) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def jobs(client):
+    """Ids of ``JOBS`` listings with an application each, created through the API."""
+    job_ids = []
+    for index in range(JOBS):
+        response = client.post("/jobs", json=job_body(
+            title=f"Python developer {index}",
+            contractType=("contract", "permanent")[index % 2],
+            rate={"amount": 100 + index, "amountPerTime": "day"},
+            location=1 + index % 2,
+            skills=[str(1 + index % 6), str(1 + (index + 1) % 6)],
+        ))
+        response.raise_for_status()
+        job_ids.append(response.json()["id"])
+        client.post("/applications", json={"job_id": job_ids[-1]}).raise_for_status()
+    return job_ids
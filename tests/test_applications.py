@@ -0,0 +1,36 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import JobApplication, job_application_daily_count
+from pyjobs.web.api.serializers import serialize_applicant_row
+
+
+def test_apply_for_missing_job(client, jobs):
+    with session_maker() as session:
+        applications = session.query(JobApplication).count()
+        daily_counts = session.query(job_application_daily_count).count()
+
+    response = client.post("/applications", json={"job_id": max(jobs) + 1000})
+
+    assert response.status_code == 404, response.text
+    with session_maker() as session:
+        assert session.query(JobApplication).count() == applications
+        assert session.query(job_application_daily_count).count() == daily_counts
+
+
+def test_delete_job_with_applications(client, jobs):
+    response = client.delete(f"/jobs/{jobs[0]}")
+
+    assert response.status_code == 409, response.text
+    assert client.get(f"/jobs/{jobs[0]}").status_code == 200
+    assert client.get(f"/jobs/{jobs[0]}/applications").json()["applications"]
+
+
+
+def test_job_applicants_leave_out_emails():
+    row = SimpleNamespace(
+        id=1, candidate_id=1, name="Wow Whew", email="wow.whew@example.com", created=datetime(2026, 1, 1), cancelled=False
+    )
+
+    assert serialize_applicant_row(row)["candidate"] == {"id": 1, "name": "Wow Whew"}
@@ -0,0 +1,34 @@
+import time
+
+import pytest
+from jose import jwt as jose_jwt
+from jose.exceptions import JWTError
+
+from pyjobs.web.auth import _decode_token
+from pyjobs.web.jwt_backends import JWTBackend, backends, get_backend
+
+
+def test_token_without_kid_is_invalid():
+    token = jose_jwt.encode({"sub": "1"}, "secret", algorithm="HS256")
+
+    with pytest.raises(JWTError, match="kid"):
+        _decode_token(token)
+
+
+@pytest.mark.parametrize("name", backends)
+def test_backends_round_trip(name):
+    backend = get_backend(name)
+    claims = {"sub": "1", "aud": "pyjobs", "exp": int(time.time()) + 60}
+    token = backend.encode(claims, "secret", "HS256", headers={"kid": "1"})
+
+    assert backend.get_unverified_header(token)["kid"] == "1"
+    assert backend.decode(token, "secret", ["HS256"], audience="pyjobs")["sub"] == "1"
+
+
+def test_backend_missing_a_method_fails_on_creation():
+    class Incomplete(JWTBackend):
+        def get_unverified_header(self, token):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
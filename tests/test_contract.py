@@ -0,0 +1,80 @@
+import copy
+from datetime import datetime
+
+import pytest
+import yaml
+from jsonschema import RefResolver
+from openapi_schema_validator import OAS30Validator, oas30_format_checker
+
+from conftest import ROOT, job_body
+
+SPEC = yaml.safe_load((ROOT / "oas" / "jobs.yaml").read_text())
+
+
+def is_timestamp(value):
+    return not isinstance(value, str) or datetime.fromisoformat(value) is not None
+
+
+# liveUntil is read and written as a naive UTC timestamp, without the offset
+# that RFC 3339 date-times need, so date-time only checks for an ISO timestamp
+format_checker = copy.copy(oas30_format_checker)
+format_checker.checkers = {**oas30_format_checker.checkers, "date-time": (is_timestamp, ValueError)}
+
+
+def assert_matches(schema, document):
+    validator = OAS30Validator(schema, resolver=RefResolver.from_schema(SPEC), format_checker=format_checker)
+    errors = [f"{list(error.absolute_path)}: {error.message}" for error in validator.iter_errors(document)]
+    assert not errors, errors
+
+
+def assert_response_matches(response, path, method):
+    operation = SPEC["paths"][path][method]
+    assert str(response.status_code) in operation["responses"], response.text
+    declared = operation["responses"][str(response.status_code)]
+    if "$ref" in declared:
+        declared = SPEC["components"]["responses"][declared["$ref"].rsplit("/", 1)[-1]]
+    if "content" not in declared:
+        assert not response.content
+        return
+    assert_matches(declared["content"]["application/json"]["schema"], response.json())
+
+
+@pytest.fixture(params=[False, True], ids=["standard", "fast"])
+def fast_responses(request, monkeypatch):
+    monkeypatch.setattr("pyjobs.web.api.api.FAST_RESPONSES", request.param)
+    return request.param
+
+
+def test_job_body_matches_create_job():
+    assert_matches(SPEC["components"]["schemas"]["CreateJob"], job_body())
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"perPage": 5, "sortBy": "rate"},
+    {"contractType": "contract", "dateSincePosted": "2020-01-01"},
+    {"perPage": 200},
+])
+def test_list_jobs_matches_spec(client, jobs, fast_responses, params):
+    assert_response_matches(client.get("/jobs", params=params), "/jobs", "get")
+
+
+def test_get_job_matches_spec(client, jobs, fast_responses):
+    assert_response_matches(client.get(f"/jobs/{jobs[0]}"), "/jobs/{id}", "get")
+    assert_response_matches(client.get(f"/jobs/{max(jobs) + 1000}"), "/jobs/{id}", "get")
+
+
+def test_job_writes_match_spec(client, jobs):
+    response = client.post("/jobs", json=job_body())
+    assert_response_matches(response, "/jobs", "post")
+    job_id = response.json()["id"]
+    try:
+        response = client.put(f"/jobs/{job_id}", json=job_body(title="Django developer"))
+        assert_response_matches(response, "/jobs/{id}", "put")
+        assert_response_matches(client.put(f"/jobs/{job_id}", json=job_body(skills=["999"])), "/jobs/{id}", "put")
+        assert_response_matches(client.post(f"/jobs/{job_id}/cancel"), "/jobs/{id}/cancel", "post")
+        assert_response_matches(client.post(f"/jobs/{job_id}/reactivate"), "/jobs/{id}/reactivate", "post")
+    finally:
+        assert_response_matches(client.delete(f"/jobs/{job_id}"), "/jobs/{id}", "delete")
+    assert_response_matches(client.post("/jobs", json=job_body(location=999)), "/jobs", "post")
+    assert_response_matches(client.delete(f"/jobs/{jobs[0]}"), "/jobs/{id}", "delete")
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+from conftest import job_body
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import Job
+
+PAST = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+
+
+def test_job_writes_reject_a_past_live_until(client, jobs):
+    assert client.post("/jobs", json=job_body(liveUntil=PAST)).status_code == 422
+    assert client.put(f"/jobs/{jobs[0]}", json=job_body(liveUntil=PAST)).status_code == 422
+
+    report = client.post("/jobs:batch", json=[job_body(liveUntil=PAST)]).json()
+    assert (report["created"], report["failed"]) == (0, 1)
+    assert report["results"][0]["errors"][0]["loc"] == ["liveUntil"]
+
+
+def test_reactivating_an_expired_job(client, jobs):
+    job_id = client.post("/jobs", json=job_body()).json()["id"]
+    try:
+        client.post(f"/jobs/{job_id}/cancel").raise_for_status()
+        with session_maker() as session:
+            session.query(Job).filter(Job.id == job_id).update({Job.live_until: datetime.utcnow()})
+            session.commit()
+
+        response = client.post(f"/jobs/{job_id}/reactivate")
+
+        assert response.status_code == 409, response.text
+        assert job_id not in [job["id"] for job in client.get("/jobs", params={"perPage": 100}).json()["jobs"]]
+    finally:
+        client.delete(f"/jobs/{job_id}").raise_for_status()
@@ -0,0 +1,12 @@
+import json
+
+
+def test_ndjson_export_matches_the_listing(client, jobs):
+    response = client.get("/jobs:export", params={"format": "ndjson"})
+
+    assert response.status_code == 200, response.text
+    lines = response.content.splitlines()
+    assert b", " not in lines[0]
+    exported = {job["id"]: job for job in map(json.loads, lines)}
+    for job in client.get("/jobs", params={"perPage": 100}).json()["jobs"]:
+        assert exported[job["id"]] == job
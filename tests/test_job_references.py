@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import job_body
+from pyjobs.models.database import session_maker
+from pyjobs.models.models import Hirer, Recruiter
+
+
+@pytest.mark.parametrize("overrides, field", [
+    ({"skills": ["1", "999"]}, "skills"),
+    ({"skills": ["Python"]}, "skills"),
+    ({"location": 999}, "location"),
+    ({"hirer": 999}, "hirer"),
+])
+def test_create_job_rejects_unknown_references(client, jobs, overrides, field):
+    response = client.post("/jobs", json=job_body(**overrides))
+
+    assert response.status_code == 422, response.text
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", field]]
+    assert client.get("/jobs", params={"perPage": 100}).status_code == 200
+
+
+@pytest.mark.parametrize("overrides, field", [
+    ({"skills": ["999"]}, "skills"),
+    ({"location": 999}, "location"),
+    ({"hirer": 999}, "hirer"),
+])
+def test_update_job_rejects_unknown_references(client, jobs, overrides, field):
+    response = client.put(f"/jobs/{jobs[0]}", json=job_body(**overrides))
+
+    assert response.status_code == 422, response.text
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", field]]
+    assert client.get(f"/jobs/{jobs[0]}").status_code == 200
+
+
+def test_batch_reads_skills_like_create_job(client, jobs):
+    response = client.post("/jobs:batch", json=[job_body(skills=["1", "3"]), job_body(skills=["Python"])])
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["created"], report["failed"]) == (1, 1)
+    assert report["results"][1]["errors"] == [{"loc": ["skills"], "msg": "Unknown skills Python"}]
+    job_id = report["results"][0]["id"]
+    try:
+        assert client.get(f"/jobs/{job_id}").json()["skills"] == ["Python", "FastAPI"]
+    finally:
+        client.delete(f"/jobs/{job_id}").raise_for_status()
+
+
+def test_job_writes_take_the_hirer_and_its_recruiter(client, jobs):
+    # Written around the ORM, so the reference data only sees it by reloading on a miss
+    with session_maker() as session:
+        hirer_id = session.execute(Hirer.__table__.insert().values(name="Snake Oil Ltd")).inserted_primary_key[0]
+        session.execute(
+            Recruiter.__table__.insert().values(name="Ann Ode", email="ann@snakeoil.example", hirer_id=hirer_id)
+        )
+        session.commit()
+
+    response = client.post("/jobs", json=job_body(hirer=hirer_id))
+    assert response.status_code == 201, response.text
+    job = response.json()
+    try:
+        assert (job["hirer"], job["recruiter"]["name"]) == ("Snake Oil Ltd", "Ann Ode")
+
+        job = client.put(f"/jobs/{job['id']}", json=job_body(hirer=1)).json()
+        assert (job["hirer"], job["recruiter"]["name"]) == ("PyJobs.works", "Joe Wow")
+    finally:
+        client.delete(f"/jobs/{job['id']}").raise_for_status()
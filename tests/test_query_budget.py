@@ -0,0 +1,21 @@
+from pyjobs.models.database import count_queries
+
+
+def test_list_jobs_statement_budget(client, jobs):
+    with count_queries() as queries:
+        response = client.get("/jobs", params={"perPage": 100})
+
+    assert response.status_code == 200
+    assert len(response.json()["jobs"]) == len(jobs)
+    # The job_card page and its count
+    assert queries.count <= 2, queries.statements
+
+
+def test_list_applications_statement_budget(client, jobs):
+    with count_queries() as queries:
+        response = client.get("/applications", params={"perPage": 100})
+
+    assert response.status_code == 200
+    assert len(response.json()["applications"]) == len(jobs)
+    # The page with its jobs joined, their skills and the count
+    assert queries.count <= 3, queries.statements
@@ -0,0 +1,44 @@
+import re
+
+import pytest
+
+from pyjobs.models.database import count_queries, engine
+
+# SQLite's EXPLAIN QUERY PLAN says "SCAN <table>" alone when it reads a table without any index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def query_plans(client, url, params):
+    """The EXPLAIN QUERY PLAN rows of every statement a GET to ``url`` runs, by statement."""
+    with count_queries() as queries:
+        response = client.get(url, params=params)
+    assert response.status_code == 200, response.text
+    with engine.connect() as connection:
+        return [
+            (statement, [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in zip(queries.statements, queries.parameters)
+        ]
+
+
+@pytest.mark.parametrize("url, params, sorts", [
+    ("/jobs", {"perPage": 10}, False),
+    ("/jobs", {"perPage": 10, "sortBy": "rate", "sortByOrder": "ascending"}, False),
+    ("/jobs", {"perPage": 10, "contractType": "contract"}, False),
+    ("/jobs", {"perPage": 10, "contractType": "permanent", "sortBy": "rate"}, False),
+    ("/jobs", {"perPage": 10, "dateSincePosted": "2020-01-01"}, False),
+    # A range on date_posted and an order on rate can't share an index; the range is the one indexed
+    ("/jobs", {"perPage": 10, "dateSincePosted": "2020-01-01", "sortBy": "rate"}, True),
+    ("/applications", {"perPage": 10}, False),
+    ("/applications", {"perPage": 10, "sortByOrder": "descending"}, False),
+    ("/jobs/{job_id}/applications", {"perPage": 10}, False),
+    ("/jobs/{job_id}/applications", {"perPage": 10, "cancelled": False}, False),
+])
+def test_listing_queries_use_indexes(client, jobs, url, params, sorts):
+    plans = query_plans(client, url.format(job_id=jobs[0]), params)
+
+    assert plans
+    for statement, plan in plans:
+        assert not [step for step in plan if FULL_SCAN.match(step)], (statement, plan)
+        if "LIMIT" in statement and not sorts:
+            assert SORT not in plan, (statement, plan)
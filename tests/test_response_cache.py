@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from conftest import job_body
+from pyjobs.models.database import count_queries
+from pyjobs.web.cache import LRUCacheBackend, ResponseCache, ResponseCacheMiddleware
+
+
+class StubMonitor:
+    enabled = True
+
+    def __init__(self, position):
+        self.position = position
+
+    def caught_up(self, written_at=None):
+        return written_at is None or self.position >= written_at
+
+
+def test_cache_is_bypassed_until_the_replica_has_the_clients_write():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        await JSONResponse({"calls": len(calls)})(scope, receive, send)
+
+    monitor = StubMonitor(position=datetime(2026, 1, 1))
+    middleware = ResponseCacheMiddleware(
+        app, routes={r"^/jobs$": "jobs"}, cache=ResponseCache(LRUCacheBackend()), monitor=monitor
+    )
+    client = TestClient(middleware)
+    assert client.get("/jobs").json() == {"calls": 1}
+    assert client.get("/jobs").json() == {"calls": 1}
+
+    written_at = datetime(2026, 1, 2).timestamp()
+    client.cookies.set("last_write", str(written_at))
+    assert client.get("/jobs").json() == {"calls": 2}
+
+    monitor.position = datetime.utcfromtimestamp(written_at)
+    assert client.get("/jobs").json() == {"calls": 1}
+
+
+@pytest.fixture
+def cached_client(client, monkeypatch):
+    """`client` with the server's response cache routes on a memory backend."""
+    from pyjobs.web.server import server
+
+    cache = ResponseCache(LRUCacheBackend())
+    # invalidate_responses bumps the module's cache
+    monkeypatch.setattr("pyjobs.web.cache.response_cache", cache)
+    routes = next(
+        middleware.options["routes"] for middleware in server.user_middleware
+        if middleware.cls is ResponseCacheMiddleware
+    )
+    return TestClient(ResponseCacheMiddleware(server, routes=routes, cache=cache))
+
+
+@pytest.fixture
+def job_id(client):
+    job_id = client.post("/jobs", json=job_body()).json()["id"]
+    yield job_id
+    client.delete(f"/jobs/{job_id}").raise_for_status()
+
+
+def test_cached_responses_have_an_etag(cached_client, job_id):
+    first = cached_client.get(f"/jobs/{job_id}")
+    with count_queries() as queries:
+        second = cached_client.get(f"/jobs/{job_id}")
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["etag"] and second.headers["etag"] == first.headers["etag"]
+    assert second.json() == first.json()
+    assert queries.count == 0
+
+
+def test_if_none_match_answers_304(cached_client, job_id):
+    etag = cached_client.get(f"/jobs/{job_id}").headers["etag"]
+
+    response = cached_client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert not response.content
+    assert cached_client.get(f"/jobs/{job_id}", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_job_writes_invalidate_cached_responses(cached_client, job_id):
+    etag = cached_client.get(f"/jobs/{job_id}").headers["etag"]
+    cached_client.get("/jobs", params={"perPage": 100})
+
+    cached_client.put(f"/jobs/{job_id}", json=job_body(title="Django developer")).raise_for_status()
+
+    with count_queries() as queries:
+        job = cached_client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag})
+    assert job.status_code == 200
+    assert job.json()["title"] == "Django developer"
+    assert queries.count
+    with count_queries() as queries:
+        jobs = cached_client.get("/jobs", params={"perPage": 100}).json()["jobs"]
+    assert queries.count
+    assert "Django developer" in [job["title"] for job in jobs]
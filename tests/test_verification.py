@@ -0,0 +1,12 @@
+import asyncio
+
+from pyjobs.web.verification import VerificationExecutor
+
+
+def test_process_workers_are_spawned():
+    executor = VerificationExecutor(len, mode="process", max_workers=1)
+    try:
+        assert asyncio.run(executor.submit("token")) == 5
+        assert executor._get_executor()._mp_context.get_start_method() == "spawn"
+    finally:
+        executor.shutdown()